@@ -0,0 +1,283 @@
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import reflex as rx
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from app.utils import admission, article_cache, content, document, export, related
+from app.utils.pipeline import (
+    ArticleBusyError,
+    QueueFullError,
+    RateLimitedError,
+    SubmissionError,
+    resummarize_article,
+    submit_article,
+    submit_articles,
+)
+
+MAX_PAGE_SIZE = 100
+STREAM_HEARTBEAT_SECONDS = 15
+TERMINAL_STATUSES = ("completed", "failed")
+DETAIL_COLUMNS = "id, url, title, status, summary, created_at, error_message, duplicate_of, stage_timings, updated_at"
+
+
+def _client_ip(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+
+def _error(message: str, status_code: int) -> JSONResponse:
+    return JSONResponse({"error": message}, status_code=status_code)
+
+
+def _submission_error(error: SubmissionError) -> JSONResponse:
+    if isinstance(error, QueueFullError):
+        retry_after = math.ceil(error.retry_after)
+        return JSONResponse(
+            {"error": str(error), "retry_after": retry_after},
+            status_code=503,
+            headers={"Retry-After": str(retry_after)},
+        )
+    status_code = 429 if isinstance(error, RateLimitedError) else 400
+    return _error(str(error), status_code)
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    return etag in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]
+
+
+async def _json_body(request: Request) -> dict | None:
+    try:
+        body = await request.json()
+    except ValueError:
+        return None
+    return body if isinstance(body, dict) else None
+
+
+async def create_article_endpoint(request: Request) -> Response:
+    body = await _json_body(request)
+    if body is None:
+        return _error("Expected a JSON object with a 'url' field.", 400)
+    try:
+        article_id = await run_in_threadpool(
+            submit_article, str(body.get("url") or ""), _client_ip(request)
+        )
+    except SubmissionError as e:
+        return _submission_error(e)
+    wait = await run_in_threadpool(admission.estimated_wait)
+    return JSONResponse(
+        {"id": article_id, "status": "queued", "estimated_wait_seconds": round(wait)},
+        status_code=202,
+        headers={"Location": f"/api/articles/{article_id}"},
+    )
+
+
+async def create_articles_batch_endpoint(request: Request) -> Response:
+    body = await _json_body(request)
+    if body is None or not isinstance(body.get("urls"), list):
+        return _error("Expected a JSON object with a 'urls' list.", 400)
+    try:
+        results = await run_in_threadpool(
+            submit_articles, body["urls"], _client_ip(request)
+        )
+    except SubmissionError as e:
+        return _submission_error(e)
+    wait = await run_in_threadpool(admission.estimated_wait)
+    return JSONResponse(
+        {"results": results, "estimated_wait_seconds": round(wait)}, status_code=202
+    )
+
+
+def _load_detail(article_id: int, search_query: str = "") -> dict | None:
+    """Load an article's metadata; the body is read only to build a search snippet."""
+    columns = f"{DETAIL_COLUMNS}, word_count" + (
+        ", content, sentence_offsets" if search_query else ""
+    )
+    with rx.session() as session:
+        row = session.execute(
+            text(f"SELECT {columns} FROM article WHERE id = :id"),
+            params={"id": article_id},
+        ).first()
+    if row is None:
+        return None
+    article = dict(row._mapping)
+    if search_query:
+        tokenized = document.unpack(
+            article.pop("content"),
+            article.pop("sentence_offsets"),
+            article["word_count"],
+        )
+        article["snippet"] = tokenized.snippet(search_query) if tokenized else None
+    article["created_at"] = str(article["created_at"]) if article["created_at"] else ""
+    article["stage_timings"] = (
+        json.loads(article["stage_timings"]) if article["stage_timings"] else {}
+    )
+    return article
+
+
+async def get_article_endpoint(request: Request) -> Response:
+    try:
+        article_id = int(request.path_params["article_id"])
+    except ValueError:
+        return _error("Article id must be an integer.", 400)
+    search_query = request.query_params.get("q", "")
+    article = await run_in_threadpool(_load_detail, article_id, search_query)
+    if article is None:
+        return _error("Article not found.", 404)
+    etag = f'W/"{article_id}-{article.pop("updated_at") or article["status"]}-{hashlib.sha1(search_query.encode()).hexdigest()[:8]}"'
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return JSONResponse(article, headers={"ETag": etag})
+
+
+async def get_article_content_endpoint(request: Request) -> Response:
+    """Return one slice of an article's content; follow ``next_offset`` for the rest."""
+    try:
+        article_id = int(request.path_params["article_id"])
+        offset = int(request.query_params.get("offset", 0))
+        limit = int(request.query_params.get("limit", content.CHUNK_CHARS))
+    except ValueError:
+        return _error("Article id, offset and limit must be integers.", 400)
+    chunk = await run_in_threadpool(content.read_chunk, article_id, offset, limit)
+    if chunk is None:
+        return _error("Article not found.", 404)
+    return JSONResponse(chunk._asdict())
+
+
+async def related_articles_endpoint(request: Request) -> Response:
+    try:
+        article_id = int(request.path_params["article_id"])
+        limit = int(request.query_params.get("limit", related.TOP_K))
+    except ValueError:
+        return _error("Article id and limit must be integers.", 400)
+    results = await run_in_threadpool(
+        related.related, article_id, min(MAX_PAGE_SIZE, max(1, limit))
+    )
+    return JSONResponse(
+        {
+            "id": article_id,
+            "related": [
+                {"id": related_id, "similarity": score} for related_id, score in results
+            ],
+        }
+    )
+
+
+async def resummarize_article_endpoint(request: Request) -> Response:
+    try:
+        article_id = int(request.path_params["article_id"])
+    except ValueError:
+        return _error("Article id must be an integer.", 400)
+    body = await _json_body(request)
+    sentences = body.get("sentences") if body is not None else None
+    if body is None or not (
+        sentences is None
+        or (isinstance(sentences, int) and not isinstance(sentences, bool))
+    ):
+        return _error("Expected a JSON object with an integer or null 'sentences'.", 400)
+    try:
+        summary = await run_in_threadpool(resummarize_article, article_id, sentences)
+    except SubmissionError as e:
+        return _error(str(e), 409 if isinstance(e, ArticleBusyError) else 400)
+    if summary is None:
+        return _error("Article not found or has no stored content.", 404)
+    return JSONResponse({"id": article_id, "sentences": sentences, "summary": summary})
+
+
+async def list_articles_endpoint(request: Request) -> Response:
+    params = request.query_params
+    try:
+        page = max(0, int(params.get("page", 0)))
+        page_size = min(
+            MAX_PAGE_SIZE, max(1, int(params.get("page_size", article_cache.PAGE_SIZE)))
+        )
+    except ValueError:
+        return _error("page and page_size must be integers.", 400)
+    status_filter = params.get("status", "all")
+    search_query = params.get("q", "")
+    sort_by = params.get("sort", "date_desc")
+    articles, total = await run_in_threadpool(
+        article_cache.query,
+        status_filter,
+        search_query,
+        sort_by,
+        page * page_size,
+        page_size,
+    )
+    for article in articles:
+        article.pop("content", None)
+    response = JSONResponse(
+        {"articles": articles, "total": total, "page": page, "page_size": page_size}
+    )
+    etag = f'W/"{hashlib.sha1(response.body).hexdigest()[:20]}"'
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return response
+
+
+async def stream_articles_endpoint(request: Request) -> Response:
+    """Stream articles as they finish, as NDJSON or (with Accept: text/event-stream) SSE."""
+    use_sse = (
+        request.query_params.get("format") == "sse"
+        or "text/event-stream" in request.headers.get("accept", "")
+    )
+    include_all = request.query_params.get("all") in ("1", "true")
+
+    async def events():
+        queue = article_cache.subscribe()
+        try:
+            while True:
+                try:
+                    article = await asyncio.wait_for(
+                        queue.get(), STREAM_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n" if use_sse else "\n"
+                    continue
+                if not include_all and article["status"] not in TERMINAL_STATUSES:
+                    continue
+                article.pop("content", None)
+                payload = json.dumps(article)
+                yield f"event: article\ndata: {payload}\n\n" if use_sse else payload + "\n"
+        except Exception as e:
+            logging.exception(f"Article stream failed: {e}")
+        finally:
+            article_cache.unsubscribe(queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream" if use_sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def export_articles_endpoint(request: Request) -> Response:
+    """Stream the filtered library as NDJSON, CSV or Markdown, gzipped with ``gzip=1``."""
+    params = request.query_params
+    export_format = params.get("format", "ndjson")
+    compress = params.get("gzip") in ("1", "true")
+    try:
+        stream = export.export(
+            export_format,
+            export.parse_fields(params.get("fields")),
+            params.get("status"),
+            params.get("since"),
+            params.get("until"),
+            params.get("q"),
+            compress,
+        )
+    except export.ExportError as e:
+        return _error(str(e), 400)
+    media_type = "application/gzip" if compress else export.FORMATS[export_format][0]
+    return StreamingResponse(
+        stream,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{export.filename(export_format, compress)}"',
+            "Cache-Control": "no-store",
+        },
+    )
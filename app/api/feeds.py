@@ -0,0 +1,37 @@
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from app.utils import feeds
+
+
+async def list_feeds_endpoint(request: Request) -> Response:
+    return JSONResponse({"feeds": await run_in_threadpool(feeds.list_feeds)})
+
+
+async def create_feed_endpoint(request: Request) -> Response:
+    try:
+        body = await request.json()
+        url = str(body.get("url") or "")
+    except (ValueError, AttributeError):
+        return JSONResponse(
+            {"error": "Expected a JSON object with a 'url' field."}, status_code=400
+        )
+    try:
+        feed_id = await run_in_threadpool(feeds.add_feed, url)
+    except feeds.FeedError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    return JSONResponse(
+        {"id": feed_id, "url": url.strip()},
+        status_code=201,
+        headers={"Location": "/api/feeds"},
+    )
+
+
+async def delete_feed_endpoint(request: Request) -> Response:
+    try:
+        feed_id = int(request.path_params["feed_id"])
+    except ValueError:
+        return JSONResponse({"error": "Feed id must be an integer."}, status_code=400)
+    if not await run_in_threadpool(feeds.remove_feed, feed_id):
+        return JSONResponse({"error": "Feed not found."}, status_code=404)
+    return Response(status_code=204)
@@ -0,0 +1,27 @@
+import logging
+import reflex as rx
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import Response
+from app.utils import metrics
+from app.utils.admission import ACTIVE_STATUSES
+
+
+def _refresh_queue_depth() -> None:
+    with rx.session() as session:
+        counts = dict(
+            session.execute(
+                text("SELECT status, COUNT(*) FROM article GROUP BY status")
+            ).all()
+        )
+    for status in ACTIVE_STATUSES:
+        metrics.QUEUE_DEPTH.set(counts.get(status, 0), status=status)
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    try:
+        await run_in_threadpool(_refresh_queue_depth)
+    except Exception as e:
+        logging.exception(f"Failed to refresh queue depth metrics: {e}")
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
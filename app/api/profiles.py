@@ -0,0 +1,76 @@
+import hmac
+import os
+from starlette.requests import Request
+from starlette.responses import FileResponse, JSONResponse, Response
+from app.utils import profiler
+
+PROFILE_TOKEN = os.environ.get("SUMMARIZER_PROFILE_TOKEN")
+
+
+async def list_profiles_endpoint(request: Request) -> Response:
+    article_id = request.query_params.get("article_id")
+    try:
+        article_id = int(article_id) if article_id else None
+    except ValueError:
+        return JSONResponse({"error": "article_id must be an integer."}, status_code=400)
+    return JSONResponse(
+        {"settings": profiler.settings(), "profiles": profiler.list_profiles(article_id)}
+    )
+
+
+async def profile_settings_endpoint(request: Request) -> Response:
+    if request.method == "GET":
+        return JSONResponse(profiler.settings())
+    if not PROFILE_TOKEN:
+        return JSONResponse(
+            {"error": "Runtime profiling changes are disabled; set SUMMARIZER_PROFILE_TOKEN."},
+            status_code=403,
+        )
+    if not hmac.compare_digest(
+        request.headers.get("X-Profile-Token", "").encode(), PROFILE_TOKEN.encode()
+    ):
+        return JSONResponse({"error": "Invalid profile token."}, status_code=403)
+    try:
+        body = await request.json()
+    except ValueError:
+        body = None
+    enabled = body.get("enabled") if isinstance(body, dict) else None
+    threshold_ms = body.get("threshold_ms") if isinstance(body, dict) else None
+    if (
+        not isinstance(body, dict)
+        or (enabled is None and threshold_ms is None)
+        or not (enabled is None or isinstance(enabled, bool))
+        or not (
+            threshold_ms is None
+            or (isinstance(threshold_ms, (int, float)) and not isinstance(threshold_ms, bool))
+        )
+    ):
+        return JSONResponse(
+            {
+                "error": "Expected JSON with a boolean 'enabled' and/or a numeric 'threshold_ms'."
+            },
+            status_code=400,
+        )
+    return JSONResponse(
+        profiler.configure(
+            enabled=enabled,
+            threshold_ms=float(threshold_ms) if threshold_ms is not None else None,
+        )
+    )
+
+
+def _download(kind: str, media_type: str):
+    async def endpoint(request: Request) -> Response:
+        profile_id = request.path_params["profile_id"]
+        path = profiler.profile_path(profile_id, kind)
+        if path is None:
+            return JSONResponse({"error": "Profile not found."}, status_code=404)
+        return FileResponse(
+            path, media_type=media_type, filename=f"{profile_id}.{kind}"
+        )
+
+    return endpoint
+
+
+download_pstats_endpoint = _download("pstats", "application/octet-stream")
+download_collapsed_endpoint = _download("collapsed", "text/plain")
@@ -0,0 +1,76 @@
+from starlette.routing import Match, Route, Router
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.api.articles import (
+    create_article_endpoint,
+    create_articles_batch_endpoint,
+    export_articles_endpoint,
+    get_article_content_endpoint,
+    get_article_endpoint,
+    list_articles_endpoint,
+    related_articles_endpoint,
+    resummarize_article_endpoint,
+    stream_articles_endpoint,
+)
+from app.api.feeds import (
+    create_feed_endpoint,
+    delete_feed_endpoint,
+    list_feeds_endpoint,
+)
+from app.api.metrics import metrics_endpoint
+from app.api.profiles import (
+    download_collapsed_endpoint,
+    download_pstats_endpoint,
+    list_profiles_endpoint,
+    profile_settings_endpoint,
+)
+
+ROUTES = [
+    Route("/api/articles", list_articles_endpoint, methods=["GET"]),
+    Route("/api/articles", create_article_endpoint, methods=["POST"]),
+    Route("/api/articles/batch", create_articles_batch_endpoint, methods=["POST"]),
+    Route("/api/articles/stream", stream_articles_endpoint, methods=["GET"]),
+    Route("/api/articles/export", export_articles_endpoint, methods=["GET"]),
+    Route("/api/articles/{article_id}", get_article_endpoint, methods=["GET"]),
+    Route(
+        "/api/articles/{article_id}/content",
+        get_article_content_endpoint,
+        methods=["GET"],
+    ),
+    Route(
+        "/api/articles/{article_id}/related",
+        related_articles_endpoint,
+        methods=["GET"],
+    ),
+    Route(
+        "/api/articles/{article_id}/summary",
+        resummarize_article_endpoint,
+        methods=["POST"],
+    ),
+    Route("/api/feeds", list_feeds_endpoint, methods=["GET"]),
+    Route("/api/feeds", create_feed_endpoint, methods=["POST"]),
+    Route("/api/feeds/{feed_id}", delete_feed_endpoint, methods=["DELETE"]),
+    Route("/metrics", metrics_endpoint, methods=["GET"]),
+    Route("/profiles", list_profiles_endpoint, methods=["GET"]),
+    Route("/profiles/settings", profile_settings_endpoint, methods=["GET", "POST"]),
+    Route("/profiles/{profile_id}.pstats", download_pstats_endpoint, methods=["GET"]),
+    Route(
+        "/profiles/{profile_id}.collapsed",
+        download_collapsed_endpoint,
+        methods=["GET"],
+    ),
+]
+
+
+def mount_api(reflex_app: ASGIApp) -> ASGIApp:
+    """Reflex api_transformer serving our routes and passing the rest through."""
+    router = Router(routes=ROUTES)
+
+    async def dispatch(scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and any(
+            route.matches(scope)[0] != Match.NONE for route in router.routes
+        ):
+            await router(scope, receive, send)
+            return
+        await reflex_app(scope, receive, send)
+
+    return dispatch
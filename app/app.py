@@ -3,6 +3,9 @@ from app.states.article_state import ArticleState
 from app.components.article_card import article_card
 from app.components.empty_state import empty_state
 from app.components.delete_modal import delete_modal
+from app.api.routes import mount_api
+from app.utils import coordination, metrics
+from app.utils.worker import WORKER_TASKS
 
 
 def url_submission_form() -> rx.Component:
@@ -30,6 +33,15 @@ def url_submission_form() -> rx.Component:
             ),
             class_name="flex w-full max-w-2xl mx-auto shadow-lg rounded-lg",
         ),
+        rx.cond(
+            ArticleState.queue_status != "",
+            rx.el.div(
+                rx.icon("clock", class_name="h-4 w-4 mr-2"),
+                ArticleState.queue_status,
+                class_name="flex items-center justify-center mt-3 text-xs text-gray-400 w-full max-w-2xl mx-auto",
+            ),
+            None,
+        ),
         rx.cond(
             ArticleState.error_message != "",
             rx.el.div(
@@ -46,7 +58,7 @@ def url_submission_form() -> rx.Component:
 
 
 def filter_controls() -> rx.Component:
-    status_filters = ["all", "pending", "processing", "completed", "failed"]
+    status_filters = ["all", "queued", "pending", "processing", "completed", "failed"]
     return rx.el.div(
         rx.el.div(
             rx.foreach(
@@ -171,6 +183,37 @@ def loading_skeleton() -> rx.Component:
     )
 
 
+def pagination_controls() -> rx.Component:
+    return rx.cond(
+        ArticleState.total_pages > 1,
+        rx.el.div(
+            rx.el.button(
+                rx.icon("chevron-left", class_name="h-4 w-4"),
+                "Previous",
+                on_click=ArticleState.previous_page,
+                disabled=ArticleState.page == 0,
+                class_name="flex items-center gap-1 px-4 py-2 text-sm font-semibold rounded-lg bg-gray-800 text-gray-300 hover:bg-gray-700 disabled:opacity-50 disabled:cursor-not-allowed transition-all",
+            ),
+            rx.el.span(
+                "Page ",
+                ArticleState.page + 1,
+                " of ",
+                ArticleState.total_pages,
+                class_name="text-sm text-gray-400",
+            ),
+            rx.el.button(
+                "Next",
+                rx.icon("chevron-right", class_name="h-4 w-4"),
+                on_click=ArticleState.next_page,
+                disabled=ArticleState.page + 1 >= ArticleState.total_pages,
+                class_name="flex items-center gap-1 px-4 py-2 text-sm font-semibold rounded-lg bg-gray-800 text-gray-300 hover:bg-gray-700 disabled:opacity-50 disabled:cursor-not-allowed transition-all",
+            ),
+            class_name="flex items-center justify-center gap-4 mt-8",
+        ),
+        None,
+    )
+
+
 def article_list() -> rx.Component:
     return rx.cond(
         ArticleState.filtered_and_sorted_articles.length() > 0,
@@ -218,6 +261,7 @@ def index() -> rx.Component:
                 search_and_sort_controls(),
                 filter_controls(),
                 rx.cond(ArticleState.is_loading, loading_skeleton(), article_list()),
+                pagination_controls(),
                 class_name="w-full max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 py-8",
             ),
             class_name="min-h-screen w-full",
@@ -228,6 +272,7 @@ def index() -> rx.Component:
 
 app = rx.App(
     theme=rx.theme(appearance="light"),
+    api_transformer=mount_api,
     head_components=[
         rx.el.link(rel="preconnect", href="https://fonts.googleapis.com"),
         rx.el.link(rel="preconnect", href="https://fonts.gstatic.com", cross_origin=""),
@@ -237,6 +282,14 @@ app = rx.App(
         ),
     ],
 )
+app.register_lifespan_task(coordination.listen_for_changes)
+if coordination.runs_workers():
+    for task in WORKER_TASKS:
+        app.register_lifespan_task(task)
+metrics.instrument_sqlalchemy()
+metrics.ACTIVE_STATES.set_function(
+    lambda: len(getattr(app.event_namespace, "token_to_sid", {}))
+)
 from app.pages.article_detail import article_detail_page
 
 app.add_page(index, on_load=ArticleState.on_load, route="/")
@@ -10,6 +10,14 @@ def status_badge(status: str) -> rx.Component:
         status.capitalize(),
         class_name=rx.match(
             status,
+            (
+                "queued",
+                "w-fit px-3 py-1 text-xs font-semibold rounded-full border bg-gray-400/10 text-gray-300 border-gray-400/20",
+            ),
+            (
+                "fetching",
+                "w-fit px-3 py-1 text-xs font-semibold rounded-full border bg-indigo-400/10 text-indigo-400 border-indigo-400/20",
+            ),
             (
                 "pending",
                 "w-fit px-3 py-1 text-xs font-semibold rounded-full border bg-yellow-400/10 text-yellow-400 border-yellow-400/20",
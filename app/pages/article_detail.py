@@ -26,6 +26,29 @@ def detail_skeleton() -> rx.Component:
     )
 
 
+def summary_length_control() -> rx.Component:
+    return rx.el.div(
+        rx.cond(
+            ArticleState.is_resummarizing,
+            rx.icon("loader-circle", class_name="h-4 w-4 animate-spin text-purple-400"),
+            rx.icon("ruler", class_name="h-4 w-4 text-gray-400"),
+        ),
+        rx.el.select(
+            rx.el.option("Auto length", value="auto"),
+            *[
+                rx.el.option(f"{count} sentences", value=str(count))
+                for count in [1, 2, 3, 4, 5, 6, 8, 10, 15]
+            ],
+            on_change=ArticleState.set_summary_length,
+            value=ArticleState.summary_length,
+            disabled=ArticleState.is_resummarizing,
+            class_name="bg-gray-800/50 text-white rounded-lg pl-3 pr-8 py-2 border-transparent focus:border-purple-500 focus:ring-purple-500 text-sm disabled:opacity-50",
+            custom_attrs={"aria-label": "Summary length"},
+        ),
+        class_name="flex items-center gap-2",
+    )
+
+
 def summary_section(article: rx.Var[dict]) -> rx.Component:
     return rx.el.div(
         rx.el.h2("Summary", class_name="text-2xl font-bold text-white mb-4"),
@@ -33,11 +56,15 @@ def summary_section(article: rx.Var[dict]) -> rx.Component:
             (article["status"] == "completed") & (article["summary"] != None),
             rx.el.div(
                 rx.el.p(article["summary"], class_name="text-gray-300 leading-relaxed"),
-                rx.el.button(
-                    rx.icon("copy", class_name="h-4 w-4 mr-2"),
-                    "Copy Summary",
-                    on_click=rx.set_clipboard(article["summary"]),
-                    class_name="mt-4 inline-flex items-center px-4 py-2 border border-transparent text-sm font-medium rounded-md shadow-sm text-white bg-purple-600 hover:bg-purple-700 focus:outline-none focus:ring-2 focus:ring-offset-2 focus:ring-purple-500 focus:ring-offset-gray-900 transition-all",
+                rx.el.div(
+                    rx.el.button(
+                        rx.icon("copy", class_name="h-4 w-4 mr-2"),
+                        "Copy Summary",
+                        on_click=rx.set_clipboard(article["summary"]),
+                        class_name="inline-flex items-center px-4 py-2 border border-transparent text-sm font-medium rounded-md shadow-sm text-white bg-purple-600 hover:bg-purple-700 focus:outline-none focus:ring-2 focus:ring-offset-2 focus:ring-purple-500 focus:ring-offset-gray-900 transition-all",
+                    ),
+                    summary_length_control(),
+                    class_name="mt-4 flex items-center gap-4 flex-wrap",
                 ),
                 class_name="p-6 bg-gray-800/50 rounded-lg border border-purple-900/30",
             ),
@@ -81,20 +108,85 @@ def summary_section(article: rx.Var[dict]) -> rx.Component:
     )
 
 
+def content_page_button(label: str, icon: str, on_click) -> rx.Component:
+    return rx.el.button(
+        rx.cond(
+            ArticleState.is_loading_content,
+            rx.icon("loader-circle", class_name="h-4 w-4 mr-2 animate-spin"),
+            rx.icon(icon, class_name="h-4 w-4 mr-2"),
+        ),
+        label,
+        on_click=on_click,
+        disabled=ArticleState.is_loading_content,
+        class_name="flex items-center justify-center w-full px-4 py-2 text-sm font-semibold rounded-lg bg-gray-800 text-gray-300 hover:bg-gray-700 disabled:opacity-50 transition-all",
+    )
+
+
 def article_content_section(article: rx.Var[dict]) -> rx.Component:
     return rx.el.div(
         rx.el.h2("Full Content", class_name="text-2xl font-bold text-white mb-4"),
         rx.el.div(
-            rx.el.p(
-                article["content"],
-                class_name="text-gray-400 whitespace-pre-wrap leading-relaxed",
+            rx.cond(
+                ArticleState.has_earlier_content,
+                content_page_button(
+                    "Show earlier", "chevron-up", ArticleState.load_earlier_content
+                ),
+                None,
+            ),
+            rx.foreach(
+                ArticleState.content_chunks,
+                lambda chunk: rx.el.p(
+                    chunk,
+                    class_name="text-gray-400 whitespace-pre-wrap leading-relaxed",
+                ),
             ),
-            class_name="p-6 bg-gray-800/50 rounded-lg max-h-96 overflow-y-auto border border-purple-900/30",
+            rx.cond(
+                ArticleState.has_more_content,
+                content_page_button(
+                    "Load more", "chevron-down", ArticleState.load_more_content
+                ),
+                None,
+            ),
+            class_name="flex flex-col gap-4 p-6 bg-gray-800/50 rounded-lg max-h-96 overflow-y-auto border border-purple-900/30",
+        ),
+        rx.el.p(
+            ArticleState.content_end,
+            " of ",
+            ArticleState.content_length,
+            " characters loaded",
+            class_name="text-xs text-gray-500 mt-2",
         ),
         class_name="mt-8",
     )
 
 
+def related_articles_section() -> rx.Component:
+    return rx.cond(
+        ArticleState.related_articles.length() > 0,
+        rx.el.div(
+            rx.el.h2("Related Articles", class_name="text-2xl font-bold text-white mb-4"),
+            rx.el.div(
+                rx.foreach(
+                    ArticleState.related_articles,
+                    lambda item: rx.el.a(
+                        rx.el.span(item["title"], class_name="text-gray-300 truncate"),
+                        rx.el.span(
+                            item["score"],
+                            "% match",
+                            class_name="text-xs text-gray-500 whitespace-nowrap",
+                        ),
+                        href=f"/article/{item['id']}",
+                        class_name="flex items-center justify-between gap-4 p-4 bg-gray-800/50 rounded-lg border border-purple-900/30 hover:border-purple-500/50 transition-colors",
+                    ),
+                ),
+                class_name="flex flex-col gap-2",
+            ),
+            class_name="mt-8",
+        ),
+        None,
+    )
+
+
 def article_detail_view() -> rx.Component:
     return rx.cond(
         ArticleState.is_loading_article,
@@ -123,6 +215,7 @@ def article_detail_view() -> rx.Component:
                 ),
                 summary_section(ArticleState.current_article),
                 article_content_section(ArticleState.current_article),
+                related_articles_section(),
             ),
             rx.el.div("Article not found.", class_name="text-center text-gray-400"),
         ),
@@ -1,29 +1,94 @@
 import reflex as rx
 from app.models import Article
-import datetime
-import requests
-from bs4 import BeautifulSoup
 import logging
 from sqlalchemy import text, select, update, bindparam, func
-from app.utils.summarizer import summarize_text_lsa
-from app.utils.text_cleaner import clean_text
-from app.utils.rate_limiter import is_rate_limited
-from app.utils.url_validator import is_safe_url
+from app.utils import admission, article_cache, content, near_duplicates, related
+from app.utils.database import ensure_schema
+from app.utils.pipeline import (
+    SubmissionError,
+    resummarize_article,
+    retry_article,
+    submit_article,
+)
 import asyncio
-import re
+
+POLL_INTERVAL_SECONDS = 2
+MAX_LOADED_CHUNKS = 8
+
+
+def _load_article(article_id: int) -> Article | None:
+    """Load an article for the detail page; its content is paged in separately."""
+    with rx.session() as session:
+        result = session.execute(
+            text(
+                "SELECT id, url, title, status, summary, created_at, error_message FROM article WHERE id = :id"
+            ),
+            params={"id": article_id},
+        ).first()
+    if not result:
+        return None
+    return Article(
+        id=result[0],
+        url=result[1],
+        title=result[2],
+        status=result[3],
+        content=None,
+        summary=result[4],
+        created_at=result[5],
+        error_message=result[6],
+    )
+
+
+def _summary_length(article_id: int) -> str:
+    with rx.session() as session:
+        sentences = session.execute(
+            text("SELECT summary_sentences FROM article WHERE id = :id"),
+            params={"id": article_id},
+        ).scalar_one_or_none()
+    return str(sentences) if sentences else "auto"
+
+
+def _queue_status() -> str:
+    depth = admission.backlog()
+    if not depth:
+        return ""
+    wait = admission.describe_wait(admission.estimated_wait(depth))
+    return f"{depth} article{'s' if depth != 1 else ''} in the queue, estimated wait {wait}."
+
+
+def _related_articles(article_id: int) -> list[dict]:
+    results = []
+    for related_id, score in related.related(article_id):
+        article = article_cache.get(related_id)
+        if article:
+            results.append(
+                {"id": related_id, "title": article["title"], "score": round(score * 100)}
+            )
+    return results
 
 
 class ArticleState(rx.State):
-    articles: list[Article] = []
+    cache_version: int = -1
     error_message: str = ""
+    queue_status: str = ""
     is_loading: bool = True
+    is_polling: bool = False
     is_submitting: bool = False
-    is_processing_queue: bool = False
     current_article: Article | None = None
     is_loading_article: bool = False
+    summary_length: str = "auto"
+    related_articles: list[dict] = []
+    content_chunks: list[str] = []
+    content_chunk_starts: list[int] = []
+    content_end: int = 0
+    content_length: int = 0
+    is_loading_content: bool = False
+    _dropped_chunk_starts: list[int] = []
+    is_resummarizing: bool = False
     search_query: str = ""
     status_filter: str = "all"
     sort_by: str = "date_desc"
+    page: int = 0
     view_mode: str = "grid"
     show_delete_modal: bool = False
     article_id_to_delete: int | None = None
@@ -32,65 +97,45 @@ class ArticleState(rx.State):
 
     @rx.var
     def filtered_and_sorted_articles(self) -> list[Article]:
-        articles = self.articles
-        if self.status_filter != "all":
-            articles = [art for art in articles if art["status"] == self.status_filter]
-        if self.search_query:
-            query = self.search_query.lower()
-            articles = [
-                art
-                for art in articles
-                if query in art["title"].lower() or query in art["url"].lower()
-            ]
-        if self.sort_by == "date_asc":
-            articles.sort(key=lambda art: art["created_at"])
-        elif self.sort_by == "status":
-            articles.sort(key=lambda art: art["status"])
-        else:
-            articles.sort(key=lambda art: art["created_at"], reverse=True)
+        if self.cache_version < 0:
+            return []
+        articles, _ = article_cache.query(
+            self.status_filter,
+            self.search_query,
+            self.sort_by,
+            offset=self.page * article_cache.PAGE_SIZE,
+        )
         return articles
 
+    @rx.var
+    def has_more_content(self) -> bool:
+        return self.content_end < self.content_length
+
+    @rx.var
+    def has_earlier_content(self) -> bool:
+        return len(self.content_chunk_starts) > 0 and self.content_chunk_starts[0] > 0
+
+    @rx.var
+    def total_pages(self) -> int:
+        if self.cache_version < 0:
+            return 1
+        _, total = article_cache.query(
+            self.status_filter, self.search_query, self.sort_by, limit=0
+        )
+        return max(1, -(-total // article_cache.PAGE_SIZE))
+
     @rx.event
     def on_load(self) -> rx.event.EventSpec:
         self.is_loading = True
-        with rx.session() as session:
-            session.execute(
-                text("""
-                CREATE TABLE IF NOT EXISTS article (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    url TEXT NOT NULL,
-                    title TEXT NOT NULL,
-                    status TEXT NOT NULL,
-                    content TEXT,
-                    summary TEXT,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    error_message TEXT
-                );
-                """)
-            )
-            session.commit()
+        ensure_schema()
         return [ArticleState.load_articles, ArticleState.poll_for_updates]
 
     @rx.event
     def load_articles(self):
         try:
-            with rx.session() as session:
-                result = session.execute(
-                    text("SELECT * FROM article ORDER BY created_at DESC")
-                ).all()
-                self.articles = [
-                    Article(
-                        id=row[0],
-                        url=row[1],
-                        title=row[2],
-                        status=row[3],
-                        content=row[4],
-                        summary=row[5],
-                        created_at=row[6],
-                        error_message=row[7],
-                    )
-                    for row in result
-                ]
+            article_cache.ensure_loaded()
+            self.cache_version = article_cache.version()
+            self.queue_status = _queue_status()
         finally:
             self.is_loading = False
 
@@ -99,222 +144,22 @@ class ArticleState(rx.State):
         self.error_message = ""
         self.is_submitting = True
         yield
-        url = form_data.get("url", "").strip()
-        if not url:
-            self.error_message = "URL is required."
-            self.is_submitting = False
-            yield rx.toast.error("Please enter a URL.")
-            return
-        if len(url) > 2048:
-            self.error_message = "URL is too long (max 2048 characters)."
-            self.is_submitting = False
-            yield rx.toast.error(self.error_message)
-            return
-        client_ip = self.router.session.client_ip
-        if is_rate_limited(client_ip):
-            self.error_message = "Rate limit exceeded. Please try again in an hour."
-            self.is_submitting = False
-            yield rx.toast.error(self.error_message)
-            return
-        validation_error = is_safe_url(url)
-        if validation_error:
-            self.error_message = validation_error
-            self.is_submitting = False
-            yield rx.toast.error(validation_error)
-            return
         try:
-            headers = {
-                "User-Agent": "Read-it-Later-Summarizer/1.0",
-                "Accept": "text/html, text/plain",
-                "Accept-Language": "en-US,en;q=0.9",
-                "Accept-Encoding": "gzip, deflate",
-            }
-            with requests.get(
-                url, headers=headers, timeout=15, stream=True, allow_redirects=False
-            ) as response:
-                response.raise_for_status()
-                content_type = response.headers.get("Content-Type", "").lower()
-                if not any((ct in content_type for ct in ["text/html", "text/plain"])):
-                    self.error_message = "Unsupported content type. Only HTML and plain text are supported."
-                    yield rx.toast.error(self.error_message)
-                    self.is_submitting = False
-                    return
-                content_length = response.headers.get("Content-Length")
-                if content_length and int(content_length) > 5 * 1024 * 1024:
-                    self.error_message = "Content is too large (max 5MB)."
-                    yield rx.toast.error(self.error_message)
-                    self.is_submitting = False
-                    return
-                content_chunks = []
-                total_size = 0
-                for chunk in response.iter_content(chunk_size=8192):
-                    total_size += len(chunk)
-                    if total_size > 5 * 1024 * 1024:
-                        self.error_message = "Content is too large (max 5MB)."
-                        yield rx.toast.error(self.error_message)
-                        self.is_submitting = False
-                        return
-                    content_chunks.append(chunk)
-                full_content = b"".join(content_chunks)
-            soup = BeautifulSoup(full_content, "html.parser")
-            og_title = soup.find("meta", property="og:title")
-            if og_title and og_title.get("content"):
-                title = og_title["content"]
-            else:
-                title = soup.title.string if soup.title else ""
-            content = clean_text(soup.get_text(separator=" ", strip=True))
-            if len(content) < 100:
-                self.error_message = "Content could not be properly extracted or is too short after cleaning."
-                yield rx.toast.error(self.error_message)
-                self.is_submitting = False
-                return
-            non_alphanumeric_count = len(re.findall("[^A-Za-z0-9\\s]", content))
-            if non_alphanumeric_count / len(content) > 0.5:
-                self.error_message = "The extracted content appears to be mostly special characters or is garbled."
-                yield rx.toast.error(self.error_message)
-                self.is_submitting = False
-                return
-            title = clean_text(title)
-            if not title:
-                title = " ".join(content.split()[:10])
-            title = title[:100]
-            with rx.session() as session:
-                new_article = text(
-                    "INSERT INTO article (url, title, status, content, created_at) VALUES (:url, :title, :status, :content, :created_at) RETURNING id"
-                )
-                result = session.execute(
-                    new_article,
-                    params={
-                        "url": url,
-                        "title": title,
-                        "status": "pending",
-                        "content": content,
-                        "created_at": datetime.datetime.now(
-                            datetime.timezone.utc
-                        ).isoformat(),
-                    },
-                ).scalar_one()
-                session.commit()
-            yield ArticleState.load_articles()
-            yield ArticleState.process_article_queue()
-            yield rx.toast.success(f"Article '{title[:30]}...' added successfully!")
-        except requests.exceptions.Timeout as e:
-            logging.exception(f"Timeout while fetching URL: {url}: {e}")
-            self.error_message = (
-                "The request timed out. The website might be slow or offline."
-            )
-            yield rx.toast.error(self.error_message)
-        except requests.exceptions.HTTPError as e:
-            logging.exception(f"HTTP error for URL {url}: {e}")
-            status_code = e.response.status_code if e.response else "Unknown"
-            if status_code == 403:
-                self.error_message = "Access to the article was denied by the server."
-            elif status_code == 404:
-                self.error_message = "The requested article could not be found."
-            else:
-                self.error_message = (
-                    "Failed to fetch the article due to a server error."
-                )
-            yield rx.toast.error(self.error_message)
-        except requests.exceptions.RequestException as e:
-            logging.exception(f"Error fetching URL {url}: {e}")
-            self.error_message = f"Failed to fetch the article. Please check the URL and your connection."
+            submit_article(form_data.get("url", ""), self.router.session.client_ip)
+        except SubmissionError as e:
+            self.error_message = str(e)
             yield rx.toast.error(self.error_message)
+            return
         except Exception as e:
             logging.exception(f"An unexpected error occurred while adding article: {e}")
             self.error_message = "An unexpected error occurred. Please try again later."
             yield rx.toast.error(self.error_message)
+            return
         finally:
             self.is_submitting = False
-
-    @rx.event(background=True)
-    async def process_article_queue(self):
-        async with self:
-            if self.is_processing_queue:
-                return
-            self.is_processing_queue = True
-        try:
-            while True:
-                article_to_process = None
-                with rx.session() as session:
-                    result = session.execute(
-                        text(
-                            "SELECT * FROM article WHERE status = 'pending' ORDER BY created_at LIMIT 1"
-                        )
-                    ).first()
-                    if result:
-                        article_to_process = Article(
-                            id=result[0],
-                            url=result[1],
-                            title=result[2],
-                            status=result[3],
-                            content=result[4],
-                            summary=result[5],
-                            created_at=result[6],
-                            error_message=result[7],
-                        )
-                        session.execute(
-                            text(
-                                "UPDATE article SET status = 'processing' WHERE id = :id"
-                            ),
-                            params={"id": article_to_process["id"]},
-                        )
-                        session.commit()
-                async with self:
-                    if article_to_process:
-                        for i, art in enumerate(self.articles):
-                            if art["id"] == article_to_process["id"]:
-                                self.articles[i]["status"] = "processing"
-                                break
-                    else:
-                        break
-                yield
-                if not article_to_process:
-                    break
-                try:
-                    summary = summarize_text_lsa(article_to_process["content"])
-                    if not summary:
-                        raise ValueError("Summarization returned empty result.")
-                    with rx.session() as session:
-                        session.execute(
-                            text(
-                                "UPDATE article SET status = 'completed', summary = :summary WHERE id = :id"
-                            ),
-                            params={"id": article_to_process["id"], "summary": summary},
-                        )
-                        session.commit()
-                    async with self:
-                        for i, art in enumerate(self.articles):
-                            if art["id"] == article_to_process["id"]:
-                                self.articles[i]["status"] = "completed"
-                                self.articles[i]["summary"] = summary
-                                break
-                except Exception as e:
-                    logging.exception(
-                        f"Failed to summarize article {article_to_process['id']}: {e}"
-                    )
-                    error_msg = f"Summarization failed: {str(e)[:100]}"
-                    with rx.session() as session:
-                        session.execute(
-                            text(
-                                "UPDATE article SET status = 'failed', error_message = :error_message WHERE id = :id"
-                            ),
-                            params={
-                                "id": article_to_process["id"],
-                                "error_message": error_msg,
-                            },
-                        )
-                        session.commit()
-                    async with self:
-                        for i, art in enumerate(self.articles):
-                            if art["id"] == article_to_process["id"]:
-                                self.articles[i]["status"] = "failed"
-                                self.articles[i]["error_message"] = error_msg
-                                break
-                yield
-        finally:
-            async with self:
-                self.is_processing_queue = False
+        yield ArticleState.load_articles()
+        wait = admission.describe_wait(admission.estimated_wait())
+        yield rx.toast.success(f"Article queued! Estimated wait: {wait}.")
 
     @rx.event
     def load_article_detail(self):
@@ -330,39 +175,127 @@ class ArticleState(rx.State):
             return rx.redirect("/404")
         self.is_loading_article = True
         try:
-            with rx.session() as session:
-                result = session.execute(
-                    text("SELECT * FROM article WHERE id = :id"),
-                    params={"id": article_id},
-                ).first()
-                if result:
-                    self.current_article = Article(
-                        id=result[0],
-                        url=result[1],
-                        title=result[2],
-                        status=result[3],
-                        content=result[4],
-                        summary=result[5],
-                        created_at=result[6],
-                        error_message=result[7],
-                    )
-                else:
-                    self.current_article = None
-                    return rx.redirect("/404")
+            self.current_article = _load_article(article_id)
+            if self.current_article is None:
+                return rx.redirect("/404")
+            self.summary_length = _summary_length(article_id)
+            self._reset_content(article_id)
+            self.related_articles = _related_articles(article_id)
         finally:
             self.is_loading_article = False
 
+    def _reset_content(self, article_id: int):
+        chunk = content.read_chunk(article_id)
+        self._dropped_chunk_starts = []
+        self.content_chunks = [chunk.text] if chunk and chunk.text else []
+        self.content_chunk_starts = [0] if self.content_chunks else []
+        self.content_end = chunk.next_offset if chunk else 0
+        self.content_length = chunk.length if chunk else 0
+
+    @rx.event
+    def load_more_content(self):
+        if not self.current_article or not self.has_more_content:
+            return
+        self.is_loading_content = True
+        yield
+        try:
+            chunk = content.read_chunk(self.current_article["id"], self.content_end)
+            if chunk is None or not chunk.text:
+                return
+            self.content_chunks = self.content_chunks + [chunk.text]
+            self.content_chunk_starts = self.content_chunk_starts + [chunk.offset]
+            self.content_end = chunk.next_offset
+            self.content_length = chunk.length
+            if len(self.content_chunks) > MAX_LOADED_CHUNKS:
+                self._dropped_chunk_starts = self._dropped_chunk_starts + [
+                    self.content_chunk_starts[0]
+                ]
+                self.content_chunks = self.content_chunks[1:]
+                self.content_chunk_starts = self.content_chunk_starts[1:]
+        finally:
+            self.is_loading_content = False
+
+    @rx.event
+    def load_earlier_content(self):
+        if not self.current_article or not self._dropped_chunk_starts:
+            return
+        self.is_loading_content = True
+        yield
+        try:
+            start = self._dropped_chunk_starts[-1]
+            chunk = content.read_chunk(self.current_article["id"], start)
+            if chunk is None or not chunk.text:
+                return
+            self._dropped_chunk_starts = self._dropped_chunk_starts[:-1]
+            self.content_chunks = [chunk.text] + self.content_chunks
+            self.content_chunk_starts = [chunk.offset] + self.content_chunk_starts
+            if len(self.content_chunks) > MAX_LOADED_CHUNKS:
+                self.content_end = self.content_chunk_starts[-1]
+                self.content_chunks = self.content_chunks[:-1]
+                self.content_chunk_starts = self.content_chunk_starts[:-1]
+        finally:
+            self.is_loading_content = False
+
+    @rx.event(background=True)
+    async def set_summary_length(self, value: str):
+        async with self:
+            if not self.current_article or self.is_resummarizing:
+                return
+            article_id = self.current_article["id"]
+            previous_length = self.summary_length
+            self.summary_length = value
+            self.is_resummarizing = True
+        summary = None
+        try:
+            sentences_count = None if value == "auto" else int(value)
+            summary = await asyncio.to_thread(
+                resummarize_article, article_id, sentences_count
+            )
+            if summary is None:
+                yield rx.toast.error("This article has no stored content to summarize.")
+        except (SubmissionError, ValueError) as e:
+            yield rx.toast.error(str(e))
+        except Exception as e:
+            logging.exception(f"Error regenerating summary for article {article_id}: {e}")
+            yield rx.toast.error("Failed to regenerate the summary.")
+        async with self:
+            self.is_resummarizing = False
+            if summary and self.current_article and self.current_article["id"] == article_id:
+                self.current_article = {
+                    **self.current_article,
+                    "status": "completed",
+                    "summary": summary,
+                    "error_message": None,
+                }
+            elif not summary:
+                self.summary_length = previous_length
+        if summary:
+            yield rx.toast.success("Summary regenerated.")
+
     @rx.event
     def set_search_query(self, query: str):
         self.search_query = query
+        self.page = 0
 
     @rx.event
     def set_status_filter(self, status: str):
         self.status_filter = status
+        self.page = 0
 
     @rx.event
     def set_sort_by(self, sort_option: str):
         self.sort_by = sort_option
+        self.page = 0
+
+    @rx.event
+    def next_page(self):
+        if self.page + 1 < self.total_pages:
+            self.page += 1
+
+    @rx.event
+    def previous_page(self):
+        if self.page > 0:
+            self.page -= 1
 
     @rx.event
     def toggle_view_mode(self):
@@ -395,7 +328,10 @@ class ArticleState(rx.State):
                     params={"id": article_id},
                 )
                 session.commit()
-            self.articles = [art for art in self.articles if art["id"] != article_id]
+            near_duplicates.forget(article_id)
+            related.forget(article_id)
+            article_cache.remove(article_id)
+            self.cache_version = article_cache.version()
             yield rx.toast.success("Article deleted successfully.")
         except Exception as e:
             logging.exception(f"Error deleting article: {e}")
@@ -408,21 +344,15 @@ class ArticleState(rx.State):
         self.article_retrying_id = article_id
         yield
         try:
-            with rx.session() as session:
-                session.execute(
-                    text(
-                        "UPDATE article SET status = 'pending', error_message = NULL WHERE id = :id"
-                    ),
-                    params={"id": article_id},
-                )
-                session.commit()
-            for i, art in enumerate(self.articles):
-                if art["id"] == article_id:
-                    self.articles[i]["status"] = "pending"
-                    self.articles[i]["error_message"] = None
-                    break
-            yield rx.toast.info("Retrying article summarization...")
-            yield ArticleState.process_article_queue
+            status = retry_article(article_id)
+            if status is None:
+                yield rx.toast.error("Article no longer exists.")
+                return
+            self.cache_version = article_cache.version()
+            if status == "completed":
+                yield rx.toast.info("Article has already been summarized.")
+                return
+            yield rx.toast.info("Retrying article...")
         except Exception as e:
             logging.exception(f"Error retrying article: {e}")
             yield rx.toast.error("Failed to retry article.")
@@ -431,50 +361,31 @@ class ArticleState(rx.State):
 
     @rx.event(background=True)
     async def poll_for_updates(self):
+        async with self:
+            if self.is_polling:
+                return
+            self.is_polling = True
         while True:
-            await asyncio.sleep(5)
-            processing_ids = []
+            await asyncio.sleep(POLL_INTERVAL_SECONDS)
+            current_version = article_cache.version()
             async with self:
-                if self.is_loading:
+                if self.is_loading or self.cache_version == current_version:
                     continue
-                processing_ids = [
-                    art["id"]
-                    for art in self.articles
-                    if art["status"] in ["processing", "pending"]
-                ]
-            if not processing_ids:
-                continue
-            updated_articles_map = {}
-            needs_ui_update = False
-            with rx.session() as session:
-                placeholders = ",".join(["?" for _ in processing_ids])
-                query = text(f"SELECT * FROM article WHERE id IN ({placeholders})")
-                result = session.execute(query, processing_ids).all()
-                for row in result:
-                    updated_articles_map[row[0]] = Article(
-                        id=row[0],
-                        url=row[1],
-                        title=row[2],
-                        status=row[3],
-                        content=row[4],
-                        summary=row[5],
-                        created_at=row[6],
-                        error_message=row[7],
-                    )
+            queue_status = _queue_status()
             async with self:
-                for i, art in enumerate(self.articles):
-                    if art["id"] in updated_articles_map:
-                        updated_art = updated_articles_map[art["id"]]
-                        if art["status"] != updated_art["status"]:
-                            self.articles[i] = updated_art
-                            needs_ui_update = True
-                if (
-                    self.current_article
-                    and self.current_article["id"] in updated_articles_map
-                ):
-                    updated_art = updated_articles_map[self.current_article["id"]]
-                    if self.current_article["status"] != updated_art["status"]:
-                        self.current_article = updated_art
-                        needs_ui_update = True
-            if needs_ui_update:
-                yield
\ No newline at end of file
+                self.cache_version = current_version
+                self.queue_status = queue_status
+                current = self.current_article
+            if not current:
+                continue
+            cached = article_cache.get(current["id"])
+            if cached and cached["status"] != current["status"]:
+                updated_article = _load_article(current["id"])
+                async with self:
+                    if (
+                        self.current_article
+                        and self.current_article["id"] == current["id"]
+                    ):
+                        self.current_article = updated_article
+                        if not self.content_chunks:
+                            self._reset_content(current["id"])
@@ -0,0 +1,140 @@
+import datetime
+import threading
+import time
+import reflex as rx
+from sqlalchemy import bindparam, text
+from app.utils.database import ensure_schema
+
+ACTIVE_STATUSES = ["queued", "fetching", "pending", "processing"]
+MAX_BACKLOG = 500
+BULK_BACKLOG_LIMIT = 200
+DEPTH_CACHE_SECONDS = 1.0
+THROUGHPUT_WINDOW_SECONDS = 600
+THROUGHPUT_CACHE_SECONDS = 30.0
+DEFAULT_SECONDS_PER_ARTICLE = 5.0
+MIN_RETRY_AFTER_SECONDS = 5
+MAX_RETRY_AFTER_SECONDS = 3600
+STAGES = ("fetch", "extract", "clean", "summarize")
+_BUSY_QUERY = """
+SELECT COUNT(*), COUNT(DISTINCT lease_owner),
+    SUM(json_extract(stage_timings, '$.fetch')),
+    SUM(json_extract(stage_timings, '$.extract')),
+    SUM(json_extract(stage_timings, '$.clean')),
+    SUM(json_extract(stage_timings, '$.summarize') / COALESCE(json_extract(stage_timings, '$.summarize_batch'), 1))
+FROM article
+WHERE status IN ('completed', 'failed') AND stage_timings IS NOT NULL
+    AND datetime(updated_at) > datetime(:cutoff)
+"""
+
+_lock = threading.Lock()
+_depth = 0
+_depth_checked_at = float("-inf")
+_seconds_per_article = DEFAULT_SECONDS_PER_ARTICLE
+_rate_checked_at = float("-inf")
+
+
+def _count_active(session) -> int:
+    return session.execute(
+        text("SELECT COUNT(*) FROM article WHERE status IN :statuses").bindparams(
+            bindparam("statuses", expanding=True)
+        ),
+        params={"statuses": ACTIVE_STATUSES},
+    ).scalar_one()
+
+
+def backlog() -> int:
+    """Return the number of articles waiting or in flight, re-counted at most once a second."""
+    global _depth, _depth_checked_at
+    now = time.monotonic()
+    with _lock:
+        if now - _depth_checked_at < DEPTH_CACHE_SECONDS:
+            return _depth
+    ensure_schema()
+    with rx.session() as session:
+        depth = _count_active(session)
+    with _lock:
+        _depth, _depth_checked_at = depth, now
+        return _depth
+
+
+def _measure_seconds_per_article() -> float:
+    from app.utils.pipeline import stage_workers
+
+    ensure_schema()
+    cutoff = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(
+        seconds=THROUGHPUT_WINDOW_SECONDS
+    )
+    with rx.session() as session:
+        finished, processes, *busy = session.execute(
+            text(_BUSY_QUERY), params={"cutoff": cutoff.isoformat()}
+        ).one()
+    if finished < 2:
+        return DEFAULT_SECONDS_PER_ARTICLE
+    workers = stage_workers()
+    return max(
+        0.01,
+        max(
+            (seconds or 0.0) / finished / (workers[stage] * max(1, processes))
+            for stage, seconds in zip(STAGES, busy)
+        ),
+    )
+
+
+def seconds_per_article() -> float:
+    """Seconds of pipeline capacity one article takes, from recent per-stage busy time.
+
+    Each stage's average busy time per finished article is divided by its worker
+    count across the processes that finished them; the slowest stage sets the rate.
+    """
+    global _seconds_per_article, _rate_checked_at
+    now = time.monotonic()
+    with _lock:
+        if now - _rate_checked_at < THROUGHPUT_CACHE_SECONDS:
+            return _seconds_per_article
+    rate = _measure_seconds_per_article()
+    with _lock:
+        _seconds_per_article, _rate_checked_at = rate, now
+        return _seconds_per_article
+
+
+def estimated_wait(position: int | None = None) -> float:
+    """Estimate how long an article at ``position`` (default: the back) waits."""
+    return (backlog() if position is None else position) * seconds_per_article()
+
+
+def _retry_after(excess: int) -> float:
+    retry_after = excess * seconds_per_article()
+    return min(MAX_RETRY_AFTER_SECONDS, max(MIN_RETRY_AFTER_SECONDS, retry_after))
+
+
+def precheck(count: int, bulk: bool) -> float | None:
+    """Cheaply turn away ``count`` articles the cached backlog clearly has no room for."""
+    excess = backlog() + count - (BULK_BACKLOG_LIMIT if bulk else MAX_BACKLOG)
+    return _retry_after(excess) if excess > 0 else None
+
+
+def check(session, bulk: bool) -> float | None:
+    """Admit articles just inserted in ``session``, or return seconds until the client should retry.
+
+    Counts inside the inserting transaction, which already holds SQLite's write
+    lock, so concurrent submissions from any process cannot all slip under the
+    limit; the caller rolls back when a retry delay is returned.
+    """
+    global _depth, _depth_checked_at
+    depth = _count_active(session)
+    excess = depth - (BULK_BACKLOG_LIMIT if bulk else MAX_BACKLOG)
+    if excess > 0:
+        return _retry_after(excess)
+    with _lock:
+        _depth, _depth_checked_at = depth, time.monotonic()
+    return None
+
+
+def describe_wait(seconds: float) -> str:
+    if seconds < 60:
+        return "under a minute"
+    if seconds < 3600:
+        minutes = round(seconds / 60)
+        return f"about {minutes} minute{'s' if minutes != 1 else ''}"
+    hours = round(seconds / 3600, 1)
+    return f"about {hours:g} hour{'s' if hours != 1 else ''}"
@@ -0,0 +1,169 @@
+import asyncio
+import threading
+from collections import OrderedDict
+import reflex as rx
+from sqlalchemy import bindparam, text
+from app.models import Article
+from app.utils import coordination
+
+PAGE_SIZE = 24
+MAX_CACHED_VIEWS = 64
+SUBSCRIBER_QUEUE_SIZE = 1000
+LIST_COLUMNS = "id, url, title, status, summary, created_at, error_message"
+
+_articles: dict[int, Article] = {}
+_views: OrderedDict[tuple, list[Article]] = OrderedDict()
+_version = 0
+_loaded = False
+_lock = threading.RLock()
+_subscribers: list[tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = []
+
+
+def _from_row(row) -> Article:
+    return Article(
+        id=row[0],
+        url=row[1],
+        title=row[2],
+        status=row[3],
+        content=None,
+        summary=row[4],
+        created_at=str(row[5]) if row[5] is not None else "",
+        error_message=row[6],
+    )
+
+
+def _bump() -> None:
+    global _version
+    _version += 1
+    _views.clear()
+
+
+def _offer(queue: asyncio.Queue, article: Article) -> None:
+    try:
+        queue.put_nowait(article)
+    except asyncio.QueueFull:
+        pass
+
+
+def _publish(articles: list[Article]) -> None:
+    for loop, queue in list(_subscribers):
+        if loop.is_closed():
+            continue
+        for article in articles:
+            loop.call_soon_threadsafe(_offer, queue, dict(article))
+
+
+def subscribe() -> asyncio.Queue:
+    """Return a queue receiving every article refreshed from now on; call from a running loop."""
+    queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+    _subscribers.append((asyncio.get_running_loop(), queue))
+    return queue
+
+
+def unsubscribe(queue: asyncio.Queue) -> None:
+    _subscribers[:] = [entry for entry in _subscribers if entry[1] is not queue]
+
+
+def version() -> int:
+    """Return a number that changes whenever any cached article changes."""
+    return _version
+
+
+def ensure_loaded() -> None:
+    """Populate the process-wide cache from the database on first use."""
+    global _loaded
+    if _loaded:
+        return
+    with _lock:
+        if _loaded:
+            return
+        with rx.session() as session:
+            rows = session.execute(text(f"SELECT {LIST_COLUMNS} FROM article")).all()
+        _articles.clear()
+        for row in rows:
+            _articles[row[0]] = _from_row(row)
+        _loaded = True
+        _bump()
+
+
+def refresh(*article_ids: int, announce: bool = True) -> None:
+    """Re-read the given articles after a write; rows that no longer exist are dropped.
+
+    Other processes are told to do the same unless ``announce`` is false.
+    """
+    if announce:
+        coordination.publish(*article_ids)
+    if not article_ids or (not _loaded and not _subscribers):
+        return
+    with rx.session() as session:
+        rows = session.execute(
+            text(f"SELECT {LIST_COLUMNS} FROM article WHERE id IN :ids").bindparams(
+                bindparam("ids", expanding=True)
+            ),
+            params={"ids": list(article_ids)},
+        ).all()
+    found = {row[0]: _from_row(row) for row in rows}
+    with _lock:
+        if _loaded:
+            for article_id in article_ids:
+                if article_id in found:
+                    _articles[article_id] = found[article_id]
+                else:
+                    _articles.pop(article_id, None)
+            _bump()
+    _publish(list(found.values()))
+
+
+def remove(article_id: int) -> None:
+    coordination.publish(article_id)
+    with _lock:
+        if _articles.pop(article_id, None) is not None:
+            _bump()
+
+
+def get(article_id: int) -> Article | None:
+    ensure_loaded()
+    article = _articles.get(article_id)
+    return dict(article) if article else None
+
+
+def _matching(status_filter: str, search_query: str, sort_by: str) -> list[Article]:
+    key = (_version, status_filter, search_query, sort_by)
+    cached = _views.get(key)
+    if cached is not None:
+        _views.move_to_end(key)
+        return cached
+    articles = list(_articles.values())
+    if status_filter != "all":
+        articles = [art for art in articles if art["status"] == status_filter]
+    if search_query:
+        articles = [
+            art
+            for art in articles
+            if search_query in art["title"].lower() or search_query in art["url"].lower()
+        ]
+    articles.sort(key=lambda art: art["created_at"], reverse=sort_by != "date_asc")
+    if sort_by == "status":
+        articles.sort(key=lambda art: art["status"])
+    _views[key] = articles
+    while len(_views) > MAX_CACHED_VIEWS:
+        _views.popitem(last=False)
+    return articles
+
+
+def query(
+    status_filter: str = "all",
+    search_query: str = "",
+    sort_by: str = "date_desc",
+    offset: int = 0,
+    limit: int = PAGE_SIZE,
+) -> tuple[list[Article], int]:
+    """Return one page of filtered, sorted articles and the total number matching."""
+    ensure_loaded()
+    with _lock:
+        articles = _matching(status_filter, search_query.lower(), sort_by)
+        page = [dict(art) for art in articles[offset : offset + limit]]
+        return page, len(articles)
+
+
+coordination.on_change(lambda article_ids: refresh(*article_ids, announce=False))
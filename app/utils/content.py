@@ -0,0 +1,45 @@
+from typing import NamedTuple
+import reflex as rx
+from sqlalchemy import text
+
+CHUNK_CHARS = 16_000
+MAX_CHUNK_CHARS = 256_000
+
+
+class ContentChunk(NamedTuple):
+    """A slice of an article's stored content and where the next slice starts."""
+
+    offset: int
+    next_offset: int
+    length: int
+    text: str
+
+
+def _break_point(chunk: str) -> int:
+    """Cut at the last paragraph or word break in the second half of the chunk."""
+    for separator in ("\n", " "):
+        position = chunk.rfind(separator, len(chunk) // 2)
+        if position >= 0:
+            return position + 1
+    return len(chunk)
+
+
+def read_chunk(
+    article_id: int, offset: int = 0, limit: int = CHUNK_CHARS
+) -> ContentChunk | None:
+    """Read ``limit`` characters of content from ``offset`` without loading the rest."""
+    offset = max(0, offset)
+    limit = min(MAX_CHUNK_CHARS, max(1, limit))
+    with rx.session() as session:
+        row = session.execute(
+            text(
+                "SELECT substr(content, :start, :limit), length(content) FROM article WHERE id = :id"
+            ),
+            params={"id": article_id, "start": offset + 1, "limit": limit},
+        ).first()
+    if row is None:
+        return None
+    chunk, length = row[0] or "", row[1] or 0
+    if offset + len(chunk) < length:
+        chunk = chunk[: _break_point(chunk)]
+    return ContentChunk(offset, offset + len(chunk), length, chunk)
@@ -0,0 +1,297 @@
+"""Cross-process coordination: rate-limit windows, leases and change notifications.
+
+``SUMMARIZER_COORDINATION=memory`` (the default) keeps everything in process
+globals for a single backend process. ``sqlite`` shares the same primitives
+through the application database, so several web and worker processes on one
+machine (see ``SUMMARIZER_ROLE`` and ``python -m app.utils.worker``) agree on
+rate limits, run singleton jobs once, and see each other's article changes.
+"""
+
+import asyncio
+import datetime
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from collections.abc import Awaitable, Callable, Iterable
+import reflex as rx
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+BACKEND = os.environ.get("SUMMARIZER_COORDINATION", "memory")
+ROLE = os.environ.get("SUMMARIZER_ROLE", "all")
+PROCESS_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+LEASE_SECONDS = 60.0
+CHANGE_POLL_SECONDS = 0.5
+CHANGE_BATCH = 1000
+CHANGE_RETENTION_SECONDS = 3600
+EVENT_RETENTION_SECONDS = 86400
+PRUNE_EVERY_SECONDS = 300
+RESYNC_SECONDS = 30.0
+RESYNC_OVERLAP_SECONDS = 60.0
+BUSY_RETRIES = 3
+
+_backend = None
+_backend_lock = threading.Lock()
+_change_callbacks: list[Callable[[list[int]], None]] = []
+
+
+class MemoryCoordinator:
+    """Single-process coordination in plain globals."""
+
+    shared = False
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._events: dict[str, deque[float]] = defaultdict(deque)
+        self._leases: dict[str, tuple[str, float]] = {}
+
+    def _trim(self, key: str, since: float) -> deque[float]:
+        events = self._events[key]
+        while events and events[0] <= since:
+            events.popleft()
+        return events
+
+    def check_and_record(self, key: str, limit: int, window: float) -> bool:
+        now = time.time()
+        with self._lock:
+            events = self._trim(key, now - window)
+            if len(events) >= limit:
+                return False
+            events.append(now)
+            return True
+
+    def acquire_lease(self, name: str, ttl: float) -> bool:
+        now = time.time()
+        with self._lock:
+            owner, expires_at = self._leases.get(name, (PROCESS_ID, 0.0))
+            if owner != PROCESS_ID and expires_at > now:
+                return False
+            self._leases[name] = (PROCESS_ID, now + ttl)
+            return True
+
+    def release_lease(self, name: str) -> None:
+        with self._lock:
+            if self._leases.get(name, (None,))[0] == PROCESS_ID:
+                del self._leases[name]
+
+    def publish(self, article_ids: Iterable[int]) -> None:
+        pass
+
+    def changes_since(self, cursor: int | None) -> tuple[int, list[int]]:
+        return cursor or 0, []
+
+    def prune(self) -> None:
+        pass
+
+
+class SQLiteCoordinator:
+    """Coordination through tables in the shared application database.
+
+    Every check-and-set is a single SQL statement, so concurrent processes are
+    serialized by SQLite's write lock rather than by any in-process state.
+    """
+
+    shared = True
+
+    def __init__(self):
+        from app.utils.database import ensure_schema
+
+        ensure_schema()
+
+    def _write(self, statement: str, params: dict | list[dict]) -> int:
+        """Run one write (or one per parameter set), retrying while the database is busy."""
+        for attempt in range(BUSY_RETRIES):
+            try:
+                with rx.session() as session:
+                    result = session.execute(text(statement), params=params)
+                    session.commit()
+                return result.rowcount
+            except OperationalError:
+                if attempt == BUSY_RETRIES - 1:
+                    raise
+                time.sleep(0.05 * (attempt + 1))
+        return 0
+
+    def check_and_record(self, key: str, limit: int, window: float) -> bool:
+        now = time.time()
+        return bool(
+            self._write(
+                "INSERT INTO coord_event (key, at) SELECT :key, :now WHERE (SELECT COUNT(*) FROM coord_event WHERE key = :key AND at > :since) < :limit",
+                {"key": key, "now": now, "since": now - window, "limit": limit},
+            )
+        )
+
+    def acquire_lease(self, name: str, ttl: float) -> bool:
+        now = time.time()
+        return bool(
+            self._write(
+                "INSERT INTO coord_lease (name, owner, expires_at) VALUES (:name, :owner, :expires_at) ON CONFLICT (name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at WHERE coord_lease.owner = excluded.owner OR coord_lease.expires_at <= :now",
+                {"name": name, "owner": PROCESS_ID, "expires_at": now + ttl, "now": now},
+            )
+        )
+
+    def release_lease(self, name: str) -> None:
+        self._write(
+            "DELETE FROM coord_lease WHERE name = :name AND owner = :owner",
+            {"name": name, "owner": PROCESS_ID},
+        )
+
+    def publish(self, article_ids: Iterable[int]) -> None:
+        now = time.time()
+        rows = [{"id": article_id, "origin": PROCESS_ID, "now": now} for article_id in article_ids]
+        if rows:
+            self._write(
+                "INSERT INTO coord_change (article_id, origin, at) VALUES (:id, :origin, :now)",
+                rows,
+            )
+
+    def changes_since(self, cursor: int | None) -> tuple[int, list[int]]:
+        """Return the new cursor and article ids changed by other processes since ``cursor``."""
+        with rx.session() as session:
+            if cursor is None:
+                latest = session.execute(
+                    text("SELECT COALESCE(MAX(seq), 0) FROM coord_change")
+                ).scalar_one()
+                return latest, []
+            rows = session.execute(
+                text(
+                    "SELECT seq, article_id, origin FROM coord_change WHERE seq > :cursor ORDER BY seq LIMIT :limit"
+                ),
+                params={"cursor": cursor, "limit": CHANGE_BATCH},
+            ).all()
+        if not rows:
+            return cursor, []
+        changed = {article_id for _, article_id, origin in rows if origin != PROCESS_ID}
+        return rows[-1][0], sorted(changed)
+
+    def prune(self) -> None:
+        now = time.time()
+        with rx.session() as session:
+            for statement, cutoff in (
+                ("DELETE FROM coord_event WHERE at < :cutoff", now - EVENT_RETENTION_SECONDS),
+                ("DELETE FROM coord_change WHERE at < :cutoff", now - CHANGE_RETENTION_SECONDS),
+                ("DELETE FROM coord_lease WHERE expires_at < :cutoff", now),
+            ):
+                session.execute(text(statement), params={"cutoff": cutoff})
+            session.commit()
+
+
+def backend() -> MemoryCoordinator | SQLiteCoordinator:
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if BACKEND not in ("memory", "sqlite"):
+                    raise ValueError(f"Unknown SUMMARIZER_COORDINATION backend: {BACKEND}")
+                _backend = SQLiteCoordinator() if BACKEND == "sqlite" else MemoryCoordinator()
+    return _backend
+
+
+def runs_workers() -> bool:
+    """Whether this process should run the ingestion pipeline and background jobs."""
+    return ROLE in ("all", "worker")
+
+
+def publish(*article_ids: int) -> None:
+    """Tell other processes these articles changed; failures are logged, not raised."""
+    if not article_ids or not backend().shared:
+        return
+    try:
+        backend().publish(article_ids)
+    except Exception as e:
+        logging.exception(f"Failed to publish article changes {article_ids}: {e}")
+
+
+def on_change(callback: Callable[[list[int]], None]) -> None:
+    """Call ``callback(article_ids)`` (in a thread) when another process changes articles."""
+    if callback not in _change_callbacks:
+        _change_callbacks.append(callback)
+
+
+def _recently_updated(since: float) -> list[int]:
+    """Ids of articles whose ``updated_at`` is later than the ``since`` timestamp."""
+    cutoff = datetime.datetime.fromtimestamp(since, datetime.timezone.utc).isoformat()
+    with rx.session() as session:
+        return list(
+            session.execute(
+                text(
+                    "SELECT id FROM article WHERE updated_at > :cutoff ORDER BY updated_at DESC LIMIT :limit"
+                ),
+                params={"cutoff": cutoff, "limit": CHANGE_BATCH},
+            ).scalars()
+        )
+
+
+async def _notify(changed: list[int]) -> None:
+    for callback in list(_change_callbacks) if changed else []:
+        await asyncio.to_thread(callback, changed)
+
+
+async def listen_for_changes() -> None:
+    """Apply other processes' article changes until cancelled; a no-op in memory mode.
+
+    Every ``RESYNC_SECONDS`` the articles updated since the previous pass (with
+    some overlap) are re-read too, so a lost notification only delays a change.
+    """
+    if not backend().shared:
+        return
+    cursor = None
+    last_pruned = time.monotonic()
+    last_resync, resync_since = time.monotonic(), time.time()
+    while True:
+        try:
+            cursor, changed = await asyncio.to_thread(backend().changes_since, cursor)
+            await _notify(changed)
+            if time.monotonic() - last_resync > RESYNC_SECONDS:
+                since = resync_since - RESYNC_OVERLAP_SECONDS
+                last_resync, resync_since = time.monotonic(), time.time()
+                await _notify(await asyncio.to_thread(_recently_updated, since))
+            if time.monotonic() - last_pruned > PRUNE_EVERY_SECONDS:
+                last_pruned = time.monotonic()
+                await asyncio.to_thread(backend().prune)
+        except Exception as e:
+            logging.exception(f"Failed to apply article changes from other processes: {e}")
+        await asyncio.sleep(CHANGE_POLL_SECONDS)
+
+
+async def run_as_leader(name: str, job: Callable[[], Awaitable[None]]) -> None:
+    """Run ``job`` in only one process at a time, taking over if the holder dies."""
+    while True:
+        try:
+            acquired = await asyncio.to_thread(backend().acquire_lease, name, LEASE_SECONDS)
+        except Exception as e:
+            logging.exception(f"Failed to acquire the {name} lease: {e}")
+            acquired = False
+        if not acquired:
+            await asyncio.sleep(LEASE_SECONDS / 2)
+            continue
+        task = asyncio.create_task(job())
+        try:
+            while not task.done():
+                await asyncio.wait({task}, timeout=LEASE_SECONDS / 3)
+                if task.done():
+                    break
+                try:
+                    renewed = await asyncio.to_thread(
+                        backend().acquire_lease, name, LEASE_SECONDS
+                    )
+                except Exception as e:
+                    logging.exception(f"Failed to renew the {name} lease: {e}")
+                    renewed = False
+                if not renewed:
+                    logging.warning(f"Lost the {name} lease; stopping until it is free again")
+                    task.cancel()
+            if task.done() and not task.cancelled() and task.exception() is not None:
+                logging.error(f"{name} stopped: {task.exception()}")
+                await asyncio.sleep(LEASE_SECONDS / 2)
+        finally:
+            if not task.done():
+                task.cancel()
+            try:
+                await asyncio.to_thread(backend().release_lease, name)
+            except Exception as e:
+                logging.exception(f"Failed to release the {name} lease: {e}")
@@ -0,0 +1,149 @@
+import reflex as rx
+from sqlalchemy import text
+
+ARTICLE_EXTRA_COLUMNS = {
+    "stage_timings": "TEXT",
+    "updated_at": "TEXT",
+    "summary_sentences": "INTEGER",
+    "sentence_offsets": "BLOB",
+    "word_count": "INTEGER",
+    "priority": "INTEGER NOT NULL DEFAULT 0",
+    "client": "TEXT",
+    "duplicate_of": "INTEGER",
+    "lease_owner": "TEXT",
+    "lease_expires": "REAL",
+}
+EXTRA_TABLES = [
+    "CREATE INDEX IF NOT EXISTS ix_article_claim ON article (status, priority, client, created_at);",
+    "CREATE INDEX IF NOT EXISTS ix_article_updated_at ON article (updated_at);",
+    """
+    CREATE TABLE IF NOT EXISTS fetch_cache (
+        url_key TEXT PRIMARY KEY,
+        etag TEXT,
+        last_modified TEXT,
+        title TEXT NOT NULL,
+        content TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        last_used REAL NOT NULL
+    );
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_fetch_cache_last_used ON fetch_cache (last_used);",
+    """
+    CREATE TABLE IF NOT EXISTS sentence_scores (
+        content_hash TEXT NOT NULL,
+        algorithm TEXT NOT NULL,
+        scores BLOB NOT NULL,
+        created_at REAL NOT NULL,
+        PRIMARY KEY (content_hash, algorithm)
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS minhash_signature (
+        article_id INTEGER PRIMARY KEY,
+        signature BLOB NOT NULL
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS lsh_bucket (
+        band_key INTEGER NOT NULL,
+        article_id INTEGER NOT NULL,
+        PRIMARY KEY (band_key, article_id)
+    ) WITHOUT ROWID;
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_lsh_bucket_article ON lsh_bucket (article_id);",
+    """
+    CREATE TABLE IF NOT EXISTS tfidf_vector (
+        article_id INTEGER PRIMARY KEY,
+        indices BLOB NOT NULL,
+        counts BLOB NOT NULL
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS summary_cache (
+        cache_key TEXT PRIMARY KEY,
+        summary TEXT NOT NULL,
+        created_at REAL NOT NULL
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS feed (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        url TEXT NOT NULL UNIQUE,
+        title TEXT NOT NULL,
+        etag TEXT,
+        last_modified TEXT,
+        poll_seconds INTEGER NOT NULL,
+        next_poll_at REAL NOT NULL,
+        last_polled_at REAL,
+        last_error TEXT,
+        failures INTEGER NOT NULL DEFAULT 0,
+        created_at REAL NOT NULL
+    );
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_feed_next_poll_at ON feed (next_poll_at);",
+    """
+    CREATE TABLE IF NOT EXISTS feed_entry (
+        entry_key TEXT PRIMARY KEY,
+        feed_id INTEGER NOT NULL,
+        article_id INTEGER,
+        seen_at REAL NOT NULL
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS coord_event (
+        key TEXT NOT NULL,
+        at REAL NOT NULL
+    );
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_coord_event_key_at ON coord_event (key, at);",
+    """
+    CREATE TABLE IF NOT EXISTS coord_lease (
+        name TEXT PRIMARY KEY,
+        owner TEXT NOT NULL,
+        expires_at REAL NOT NULL
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS coord_change (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        article_id INTEGER NOT NULL,
+        origin TEXT NOT NULL,
+        at REAL NOT NULL
+    );
+    """,
+]
+_schema_ready = False
+
+
+def ensure_schema() -> None:
+    """Create the tables and add any columns missing from older databases."""
+    global _schema_ready
+    if _schema_ready:
+        return
+    with rx.session() as session:
+        session.execute(
+            text("""
+            CREATE TABLE IF NOT EXISTS article (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT NOT NULL,
+                title TEXT NOT NULL,
+                status TEXT NOT NULL,
+                content TEXT,
+                summary TEXT,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                error_message TEXT
+            );
+            """)
+        )
+        existing_columns = {
+            row[1] for row in session.execute(text("PRAGMA table_info(article)"))
+        }
+        for name, definition in ARTICLE_EXTRA_COLUMNS.items():
+            if name not in existing_columns:
+                session.execute(
+                    text(f"ALTER TABLE article ADD COLUMN {name} {definition}")
+                )
+        for statement in EXTRA_TABLES:
+            session.execute(text(statement))
+        session.commit()
+    _schema_ready = True
@@ -0,0 +1,75 @@
+import logging
+import re
+from array import array
+from typing import NamedTuple
+
+from app.utils import nlp_data
+
+_FALLBACK_SENTENCE_END = re.compile("(?<=[.!?])\\s+")
+
+
+class TokenizedDocument(NamedTuple):
+    """Cleaned text plus sentence boundaries, computed once at ingest."""
+
+    text: str
+    offsets: array
+    word_count: int
+
+    @property
+    def sentence_count(self) -> int:
+        return len(self.offsets) // 2
+
+    def sentence(self, index: int) -> str:
+        return self.text[self.offsets[2 * index] : self.offsets[2 * index + 1]]
+
+    def sentences(self) -> list[str]:
+        return [self.sentence(index) for index in range(self.sentence_count)]
+
+    def snippet(self, query: str, max_length: int = 240) -> str | None:
+        """Return the first sentence containing ``query``, trimmed for display."""
+        position = self.text.lower().find(query.lower()) if query else -1
+        if position < 0:
+            return None
+        for index in range(self.sentence_count):
+            if self.offsets[2 * index + 1] > position:
+                sentence = self.sentence(index)
+                return sentence if len(sentence) <= max_length else sentence[: max_length - 3] + "..."
+        return None
+
+
+def _split_sentences(text: str) -> list[str]:
+    try:
+        return list(nlp_data.tokenizer().to_sentences(text))
+    except LookupError as e:
+        nlp_data.report_fallback(e)
+    except Exception as e:
+        logging.exception(f"Sentence tokenizer failed, using regex split: {e}")
+    return [part for part in _FALLBACK_SENTENCE_END.split(text) if part]
+
+
+def tokenize(cleaned_text: str) -> TokenizedDocument:
+    """Split cleaned text into sentences and record their character offsets."""
+    offsets = array("I")
+    cursor = 0
+    for sentence in _split_sentences(cleaned_text):
+        start = cleaned_text.find(sentence, cursor)
+        if start < 0:
+            continue
+        cursor = start + len(sentence)
+        offsets.extend((start, cursor))
+    return TokenizedDocument(cleaned_text, offsets, len(cleaned_text.split()))
+
+
+def pack(document: TokenizedDocument) -> bytes:
+    return document.offsets.tobytes()
+
+
+def unpack(text: str, packed_offsets: bytes | None, word_count: int | None) -> TokenizedDocument | None:
+    """Rebuild a stored document; ``None`` when the row predates tokenization."""
+    if not text or packed_offsets is None:
+        return None
+    offsets = array("I")
+    offsets.frombytes(bytes(packed_offsets))
+    return TokenizedDocument(
+        text, offsets, word_count if word_count is not None else len(text.split())
+    )
@@ -0,0 +1,236 @@
+"""Stream the article library out as NDJSON, CSV or Markdown, optionally gzipped.
+
+Rows are read in short keyset-paginated batches, so memory stays flat and no
+long read transaction blocks the pipeline's writes. CLI:
+``python -m app.utils.export --format csv --status completed -o library.csv``.
+"""
+
+import argparse
+import csv
+import datetime
+import io
+import json
+import sys
+import zlib
+from collections.abc import Iterator
+import reflex as rx
+from sqlalchemy import text
+
+FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "markdown": ("text/markdown; charset=utf-8", "md"),
+}
+FIELDS = (
+    "id",
+    "url",
+    "title",
+    "status",
+    "summary",
+    "content",
+    "error_message",
+    "word_count",
+    "duplicate_of",
+    "created_at",
+    "updated_at",
+)
+DEFAULT_FIELDS = ("id", "url", "title", "status", "summary", "created_at")
+STATUSES = ("queued", "fetching", "pending", "processing", "completed", "failed")
+BATCH_SIZE = 500
+CONTENT_BATCH_SIZE = 25
+
+
+class ExportError(Exception):
+    """Invalid export parameters; the message is user-facing."""
+
+
+def parse_fields(value: str | None) -> list[str]:
+    if not value:
+        return list(DEFAULT_FIELDS)
+    fields = [field.strip() for field in value.split(",") if field.strip()]
+    unknown = [field for field in fields if field not in FIELDS]
+    if unknown or not fields:
+        raise ExportError(
+            f"Unknown fields: {', '.join(unknown) or '(none)'}. Choose from {', '.join(FIELDS)}."
+        )
+    return list(dict.fromkeys(fields))
+
+
+def _parse_date(value: str | None, name: str) -> str | None:
+    if not value:
+        return None
+    try:
+        return datetime.datetime.fromisoformat(value).isoformat()
+    except ValueError:
+        raise ExportError(f"'{name}' must be an ISO date such as 2024-05-31.")
+
+
+def _filters(
+    status: str | None, since: str | None, until: str | None, search_query: str | None
+) -> tuple[str, dict]:
+    conditions = ["id > :last_id"]
+    params = {}
+    if status and status != "all":
+        if status not in STATUSES:
+            raise ExportError(f"Unknown status '{status}'.")
+        conditions.append("status = :status")
+        params["status"] = status
+    for name, value, operator in (("since", since, ">="), ("until", until, "<")):
+        parsed = _parse_date(value, name)
+        if parsed:
+            conditions.append(f"datetime(created_at) {operator} datetime(:{name})")
+            params[name] = parsed
+    if search_query:
+        conditions.append("(instr(lower(title), :q) > 0 OR instr(lower(url), :q) > 0)")
+        params["q"] = search_query.lower()
+    return " AND ".join(conditions), params
+
+
+def iter_rows(
+    fields: list[str],
+    status: str | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    search_query: str | None = None,
+) -> Iterator[list[dict]]:
+    """Yield batches of matching articles in id order, one short query per batch."""
+    where, params = _filters(status, since, until, search_query)
+    columns = ", ".join(["id"] + [field for field in fields if field != "id"])
+    limit = CONTENT_BATCH_SIZE if "content" in fields else BATCH_SIZE
+    last_id = 0
+    while True:
+        with rx.session() as session:
+            batch = session.execute(
+                text(
+                    f"SELECT {columns} FROM article WHERE {where} ORDER BY id LIMIT :limit"
+                ),
+                params={**params, "last_id": last_id, "limit": limit},
+            ).all()
+        if not batch:
+            return
+        last_id = batch[-1][0]
+        rows = []
+        for row in batch:
+            record = row._mapping
+            rows.append(
+                {
+                    field: str(record[field])
+                    if field == "created_at" and record[field] is not None
+                    else record[field]
+                    for field in fields
+                }
+            )
+        yield rows
+
+
+def _ndjson(batches: Iterator[list[dict]], fields: list[str]) -> Iterator[str]:
+    for rows in batches:
+        yield "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+
+
+def _csv(batches: Iterator[list[dict]], fields: list[str]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields)
+    writer.writeheader()
+    for rows in batches:
+        writer.writerows(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _markdown(batches: Iterator[list[dict]], fields: list[str]) -> Iterator[str]:
+    yield "# Article export\n\n"
+    for rows in batches:
+        parts = []
+        for row in rows:
+            title = row.get("title") or row.get("url") or f"Article {row.get('id', '')}"
+            heading = f"[{title}]({row['url']})" if row.get("url") else title
+            parts.append(f"## {heading}\n\n")
+            for field in fields:
+                value = row[field]
+                if field in ("title", "url", "summary", "content") or value is None:
+                    continue
+                parts.append(f"- **{field.replace('_', ' ').capitalize()}:** {value}\n")
+            for field in ("summary", "content"):
+                if field in fields and row[field]:
+                    parts.append(f"\n### {field.capitalize()}\n\n{row[field].strip()}\n")
+            parts.append("\n---\n\n")
+        yield "".join(parts)
+
+
+_ENCODERS = {"ndjson": _ndjson, "csv": _csv, "markdown": _markdown}
+
+
+def export(
+    export_format: str,
+    fields: list[str],
+    status: str | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    search_query: str | None = None,
+    compress: bool = False,
+) -> Iterator[bytes]:
+    """Return a byte stream of the export; parameters are validated before the first chunk."""
+    if export_format not in _ENCODERS:
+        raise ExportError(f"Format must be one of {', '.join(FORMATS)}.")
+    _filters(status, since, until, search_query)
+    chunks = _ENCODERS[export_format](
+        iter_rows(fields, status, since, until, search_query), fields
+    )
+    return _gzipped(chunks) if compress else (chunk.encode("utf-8") for chunk in chunks)
+
+
+def _gzipped(chunks: Iterator[str]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk.encode("utf-8"))
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def filename(export_format: str, compress: bool) -> str:
+    stamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%d-%H%M%S")
+    return f"articles-{stamp}.{FORMATS[export_format][1]}" + (".gz" if compress else "")
+
+
+def main(argv: list[str] | None = None) -> int:
+    from app.utils.database import ensure_schema
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--format", choices=list(FORMATS), default="ndjson")
+    parser.add_argument("--fields", help=f"comma-separated, from: {', '.join(FIELDS)}")
+    parser.add_argument("--status", choices=["all", *STATUSES])
+    parser.add_argument("--since", help="created on or after this ISO date")
+    parser.add_argument("--until", help="created before this ISO date")
+    parser.add_argument("-q", "--query", help="match title or URL")
+    parser.add_argument("--gzip", action="store_true")
+    parser.add_argument("-o", "--output", help="file to write (default: stdout)")
+    args = parser.parse_args(argv)
+    try:
+        stream = export(
+            args.format,
+            parse_fields(args.fields),
+            args.status,
+            args.since,
+            args.until,
+            args.query,
+            args.gzip,
+        )
+    except ExportError as e:
+        parser.error(str(e))
+    ensure_schema()
+    output = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        for chunk in stream:
+            output.write(chunk)
+    finally:
+        if args.output:
+            output.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,330 @@
+import asyncio
+import logging
+import time
+import xml.etree.ElementTree as ElementTree
+from urllib.parse import urljoin, urlparse
+import reflex as rx
+from sqlalchemy import bindparam, text
+from app.utils import coordination, fetch_cache, politeness
+from app.utils.database import ensure_schema
+from app.utils.fetcher import FetchError, fetch_url
+from app.utils.url_validator import is_safe_url, validate_url_format
+
+FEED_CONTENT_TYPES = (
+    "application/rss+xml",
+    "application/atom+xml",
+    "application/rdf+xml",
+    "application/xml",
+    "text/xml",
+)
+DEFAULT_POLL_SECONDS = 900
+MAX_BACKOFF_SECONDS = 6 * 3600
+SCHEDULER_TICK_SECONDS = 5.0
+MAX_CONCURRENT_POLLS = 16
+MAX_DUE_PER_TICK = 200
+MAX_ENTRIES_PER_POLL = 50
+
+
+class FeedError(Exception):
+    """A feed could not be added; the message is user-facing."""
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1].lower()
+
+
+def parse_feed(body: bytes, base_url: str) -> tuple[str, list[str]]:
+    """Return the feed title and entry links of an RSS 1.0/2.0 or Atom document."""
+    root = ElementTree.fromstring(body)
+    title = ""
+    links = []
+    for element in root.iter():
+        name = _local_name(element.tag)
+        if name == "title" and not title:
+            title = (element.text or "").strip()
+        if name not in ("item", "entry"):
+            continue
+        link = None
+        for child in element:
+            child_name = _local_name(child.tag)
+            if child_name == "link":
+                if child.get("href"):
+                    if child.get("rel", "alternate") == "alternate":
+                        link = child.get("href")
+                        break
+                elif child.text and child.text.strip():
+                    link = child.text.strip()
+                    break
+            elif child_name == "guid" and child.get("isPermaLink", "true") == "true":
+                link = link or (child.text or "").strip() or None
+        if link:
+            links.append(urljoin(base_url, link))
+    return title[:200], links
+
+
+def add_feed(url: str) -> int:
+    """Subscribe to a feed URL; it is polled on the next scheduler tick."""
+    url = (url or "").strip()
+    format_error = validate_url_format(url) if url else "URL is required."
+    if format_error:
+        raise FeedError(format_error)
+    ensure_schema()
+    with rx.session() as session:
+        existing = session.execute(
+            text("SELECT id FROM feed WHERE url = :url"), params={"url": url}
+        ).scalar_one_or_none()
+        if existing is not None:
+            return existing
+        feed_id = session.execute(
+            text(
+                "INSERT INTO feed (url, title, poll_seconds, next_poll_at, created_at) VALUES (:url, :url, :poll, 0, :now) RETURNING id"
+            ),
+            params={"url": url, "poll": DEFAULT_POLL_SECONDS, "now": time.time()},
+        ).scalar_one()
+        session.commit()
+    return feed_id
+
+
+def remove_feed(feed_id: int) -> bool:
+    with rx.session() as session:
+        deleted = session.execute(
+            text("DELETE FROM feed WHERE id = :id"), params={"id": feed_id}
+        )
+        session.commit()
+    return bool(deleted.rowcount)
+
+
+def list_feeds() -> list[dict]:
+    with rx.session() as session:
+        rows = session.execute(
+            text(
+                "SELECT id, url, title, poll_seconds, next_poll_at, last_polled_at, last_error, failures FROM feed ORDER BY id"
+            )
+        ).all()
+    return [dict(row._mapping) for row in rows]
+
+
+def _due_feeds(exclude: set[int]) -> list:
+    with rx.session() as session:
+        rows = session.execute(
+            text(
+                "SELECT id, url, etag, last_modified, poll_seconds, failures FROM feed WHERE next_poll_at <= :now ORDER BY next_poll_at LIMIT :limit"
+            ),
+            params={"now": time.time(), "limit": MAX_DUE_PER_TICK + len(exclude)},
+        ).all()
+    return [row for row in rows if row[0] not in exclude][:MAX_DUE_PER_TICK]
+
+
+def _record_poll(
+    feed_id: int,
+    poll_seconds: int,
+    failures: int,
+    error: str | None,
+    title: str | None = None,
+    etag: str | None = None,
+    last_modified: str | None = None,
+    retry_after: float | None = None,
+    truncated: bool = False,
+) -> None:
+    """Store a poll's outcome and schedule the next one.
+
+    A truncated poll drops the feed's validators so the next poll gets the full
+    feed back instead of a 304, and picks up the entries left over.
+    """
+    failures = failures + 1 if error else 0
+    delay = retry_after or min(MAX_BACKOFF_SECONDS, poll_seconds * 2**failures)
+    now = time.time()
+    with rx.session() as session:
+        session.execute(
+            text(
+                "UPDATE feed SET title = COALESCE(:title, title), etag = CASE WHEN :truncated THEN NULL ELSE COALESCE(:etag, etag) END, last_modified = CASE WHEN :truncated THEN NULL ELSE COALESCE(:last_modified, last_modified) END, last_polled_at = :now, next_poll_at = :next_poll_at, last_error = :error, failures = :failures WHERE id = :id"
+            ),
+            params={
+                "id": feed_id,
+                "title": title or None,
+                "etag": etag,
+                "last_modified": last_modified,
+                "now": now,
+                "next_poll_at": now + delay,
+                "error": error,
+                "failures": failures,
+                "truncated": truncated,
+            },
+        )
+        session.commit()
+
+
+def _reserve(feed_id: int, links: list[str]) -> tuple[list[str], bool]:
+    """Claim links no feed has discovered yet, at most MAX_ENTRIES_PER_POLL of them.
+
+    Each link is reserved by inserting its normalized URL into ``feed_entry``, so
+    two polls that both see a link cannot both submit it. Returns the links this
+    call reserved and whether unseen links were left over.
+    """
+    by_key = {}
+    for link in links:
+        by_key.setdefault(fetch_cache.normalize_url(link), link)
+    reserved = []
+    now = time.time()
+    with rx.session() as session:
+        keys = list(by_key)
+        for index, key in enumerate(keys):
+            if len(reserved) >= MAX_ENTRIES_PER_POLL:
+                rest = keys[index:]
+                seen = session.execute(
+                    text(
+                        "SELECT COUNT(*) FROM feed_entry WHERE entry_key IN :keys"
+                    ).bindparams(bindparam("keys", expanding=True)),
+                    params={"keys": rest},
+                ).scalar_one()
+                session.commit()
+                return reserved, seen < len(rest)
+            inserted = session.execute(
+                text(
+                    "INSERT OR IGNORE INTO feed_entry (entry_key, feed_id, article_id, seen_at) VALUES (:key, :feed_id, NULL, :now) RETURNING entry_key"
+                ),
+                params={"key": key, "feed_id": feed_id, "now": now},
+            ).scalar_one_or_none()
+            if inserted is not None:
+                reserved.append(by_key[key])
+        session.commit()
+    return reserved, False
+
+
+def _release(links: list[str]) -> None:
+    """Give back reservations whose links were never queued, so a later poll retries them."""
+    if not links:
+        return
+    with rx.session() as session:
+        session.execute(
+            text(
+                "DELETE FROM feed_entry WHERE entry_key IN :keys AND article_id IS NULL"
+            ).bindparams(bindparam("keys", expanding=True)),
+            params={"keys": [fetch_cache.normalize_url(link) for link in links]},
+        )
+        session.commit()
+
+
+def _mark_queued(queued: dict[str, int | None]) -> None:
+    with rx.session() as session:
+        for link, article_id in queued.items():
+            if article_id is None:
+                continue
+            session.execute(
+                text(
+                    "UPDATE feed_entry SET article_id = :article_id WHERE entry_key = :key"
+                ),
+                params={"key": fetch_cache.normalize_url(link), "article_id": article_id},
+            )
+        session.commit()
+
+
+def _fetch_feed(url: str, etag: str | None, last_modified: str | None):
+    validation_error = is_safe_url(url)
+    if validation_error:
+        raise FetchError(validation_error)
+    return fetch_url(url, etag, last_modified, content_types=FEED_CONTENT_TYPES)
+
+
+async def _poll(feed, polls: asyncio.Semaphore) -> None:
+    from app.utils.pipeline import QueueFullError, submit_discovered
+
+    feed_id, url, etag, last_modified, poll_seconds, failures = feed
+    async with politeness.polite(url) as host, polls:
+        if host.robots is not None and not host.robots.can_fetch(
+            politeness.USER_AGENT, url
+        ):
+            await asyncio.to_thread(
+                _record_poll, feed_id, poll_seconds, failures, "Disallowed by robots.txt."
+            )
+            return
+        try:
+            result = await asyncio.to_thread(_fetch_feed, url, etag, last_modified)
+        except FetchError as e:
+            await asyncio.to_thread(_record_poll, feed_id, poll_seconds, failures, str(e))
+            return
+    if result.not_modified:
+        await asyncio.to_thread(
+            _record_poll, feed_id, poll_seconds, 0, None, etag=result.etag
+        )
+        return
+    try:
+        title, links = await asyncio.to_thread(parse_feed, result.body, url)
+    except ElementTree.ParseError as e:
+        await asyncio.to_thread(
+            _record_poll, feed_id, poll_seconds, failures, f"Invalid feed XML: {e}"
+        )
+        return
+    new_links, truncated = await asyncio.to_thread(_reserve, feed_id, links)
+    try:
+        queued = await asyncio.to_thread(
+            submit_discovered, new_links, f"feed:{urlparse(url).hostname}"
+        )
+    except BaseException as e:
+        await asyncio.shield(asyncio.to_thread(_release, new_links))
+        if not isinstance(e, QueueFullError):
+            raise
+        await asyncio.to_thread(
+            _record_poll,
+            feed_id,
+            poll_seconds,
+            failures,
+            str(e),
+            retry_after=e.retry_after,
+        )
+        return
+    await asyncio.to_thread(_mark_queued, queued)
+    await asyncio.to_thread(
+        _record_poll,
+        feed_id,
+        poll_seconds,
+        0,
+        None,
+        title=title,
+        etag=result.etag,
+        last_modified=result.last_modified,
+        truncated=truncated,
+    )
+
+
+async def _poll_guarded(feed, polls: asyncio.Semaphore, in_flight: set[int]) -> None:
+    try:
+        await _poll(feed, polls)
+    except Exception as e:
+        logging.exception(f"Failed to poll feed {feed[1]}: {e}")
+        try:
+            await asyncio.to_thread(
+                _record_poll, feed[0], feed[4], feed[5], "An unexpected error occurred."
+            )
+        except Exception as e:
+            logging.exception(f"Failed to record poll failure for feed {feed[1]}: {e}")
+    finally:
+        in_flight.discard(feed[0])
+
+
+async def _poll_due_feeds() -> None:
+    ensure_schema()
+    polls = asyncio.Semaphore(MAX_CONCURRENT_POLLS)
+    in_flight: set[int] = set()
+    tasks: set[asyncio.Task] = set()
+    try:
+        while True:
+            try:
+                due = await asyncio.to_thread(_due_feeds, set(in_flight))
+            except Exception as e:
+                logging.exception(f"Failed to load due feeds: {e}")
+                due = []
+            for feed in due:
+                in_flight.add(feed[0])
+                task = asyncio.create_task(_poll_guarded(feed, polls, in_flight))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await asyncio.sleep(SCHEDULER_TICK_SECONDS)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def run_feed_poller() -> None:
+    """Poll due feeds until cancelled, in one process only; an app lifespan task."""
+    await coordination.run_as_leader("feed-poller", _poll_due_feeds)
@@ -0,0 +1,91 @@
+import time
+from typing import NamedTuple
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+import reflex as rx
+from sqlalchemy import text
+
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+class CachedPage(NamedTuple):
+    etag: str | None
+    last_modified: str | None
+    title: str
+    content: str
+
+
+def normalize_url(url: str) -> str:
+    """Canonicalize a URL so trivially different spellings share a cache entry."""
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    hostname = (parsed.hostname or "").lower()
+    netloc = hostname
+    if parsed.port and parsed.port != _DEFAULT_PORTS.get(scheme):
+        netloc = f"{hostname}:{parsed.port}"
+    query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+    return urlunparse((scheme, netloc, parsed.path or "/", "", query, ""))
+
+
+def lookup(url: str) -> CachedPage | None:
+    """Return the stored validators and extracted text for a URL, if any."""
+    with rx.session() as session:
+        row = session.execute(
+            text(
+                "SELECT etag, last_modified, title, content FROM fetch_cache WHERE url_key = :url_key"
+            ),
+            params={"url_key": normalize_url(url)},
+        ).first()
+    return CachedPage(*row) if row else None
+
+
+def touch(url: str) -> None:
+    """Mark an entry as recently used after a successful revalidation."""
+    with rx.session() as session:
+        session.execute(
+            text("UPDATE fetch_cache SET last_used = :now WHERE url_key = :url_key"),
+            params={"url_key": normalize_url(url), "now": time.time()},
+        )
+        session.commit()
+
+
+def store(
+    url: str, etag: str | None, last_modified: str | None, title: str, content: str
+) -> None:
+    """Remember a page's validators and extracted text, evicting least recently used entries."""
+    if not etag and not last_modified:
+        return
+    size = len(content.encode("utf-8")) + len(title)
+    if size > MAX_CACHE_BYTES:
+        return
+    with rx.session() as session:
+        session.execute(
+            text(
+                "INSERT OR REPLACE INTO fetch_cache (url_key, etag, last_modified, title, content, size, last_used) VALUES (:url_key, :etag, :last_modified, :title, :content, :size, :now)"
+            ),
+            params={
+                "url_key": normalize_url(url),
+                "etag": etag,
+                "last_modified": last_modified,
+                "title": title,
+                "content": content,
+                "size": size,
+                "now": time.time(),
+            },
+        )
+        total_size = session.execute(
+            text("SELECT COALESCE(SUM(size), 0) FROM fetch_cache")
+        ).scalar_one()
+        if total_size > MAX_CACHE_BYTES:
+            session.execute(
+                text("""
+                DELETE FROM fetch_cache WHERE url_key IN (
+                    SELECT url_key FROM (
+                        SELECT url_key, SUM(size) OVER (ORDER BY last_used DESC) AS running_size
+                        FROM fetch_cache
+                    ) WHERE running_size > :max_bytes
+                )
+                """),
+                params={"max_bytes": MAX_CACHE_BYTES},
+            )
+        session.commit()
@@ -0,0 +1,137 @@
+import logging
+from app.utils import metrics
+from app.utils.text_cleaner import clean_text
+import re
+import time
+from typing import NamedTuple
+
+MAX_CONTENT_BYTES = 5 * 1024 * 1024
+ARTICLE_CONTENT_TYPES = ("text/html", "text/plain")
+FETCH_TIMEOUT_SECONDS = 15
+REQUEST_HEADERS = {
+    "User-Agent": "Read-it-Later-Summarizer/1.0",
+    "Accept": "text/html, text/plain",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+
+class FetchError(Exception):
+    """An article could not be fetched or extracted; the message is user-facing."""
+
+
+class FetchResult(NamedTuple):
+    body: bytes | None
+    etag: str | None
+    last_modified: str | None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.body is None
+
+
+def fetch_url(
+    url: str,
+    etag: str | None = None,
+    last_modified: str | None = None,
+    content_types: tuple[str, ...] = ARTICLE_CONTENT_TYPES,
+) -> FetchResult:
+    """Download an article body, conditionally if validators are given (304 has no body)."""
+    started = time.perf_counter()
+    total_size = 0
+    headers = dict(REQUEST_HEADERS)
+    headers["Accept"] = ", ".join(content_types)
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    import requests
+
+    try:
+        with requests.get(
+            url,
+            headers=headers,
+            timeout=FETCH_TIMEOUT_SECONDS,
+            stream=True,
+            allow_redirects=False,
+        ) as response:
+            response.raise_for_status()
+            response_etag = response.headers.get("ETag")
+            response_last_modified = response.headers.get("Last-Modified")
+            if response.status_code == 304:
+                return FetchResult(
+                    None, response_etag or etag, response_last_modified or last_modified
+                )
+            content_type = response.headers.get("Content-Type", "").lower()
+            if not any((ct in content_type for ct in content_types)):
+                raise FetchError(
+                    "Unsupported content type. Only HTML and plain text are supported."
+                    if content_types == ARTICLE_CONTENT_TYPES
+                    else f"Unsupported content type: {content_type or 'unknown'}."
+                )
+            content_length = response.headers.get("Content-Length")
+            if content_length and int(content_length) > MAX_CONTENT_BYTES:
+                raise FetchError("Content is too large (max 5MB).")
+            content_chunks = []
+            for chunk in response.iter_content(chunk_size=8192):
+                total_size += len(chunk)
+                if total_size > MAX_CONTENT_BYTES:
+                    raise FetchError("Content is too large (max 5MB).")
+                content_chunks.append(chunk)
+            metrics.FETCH_BODY_BYTES.observe(total_size)
+            return FetchResult(
+                b"".join(content_chunks), response_etag, response_last_modified
+            )
+    except requests.exceptions.Timeout as e:
+        logging.exception(f"Timeout while fetching URL: {url}: {e}")
+        raise FetchError(
+            "The request timed out. The website might be slow or offline."
+        ) from e
+    except requests.exceptions.HTTPError as e:
+        logging.exception(f"HTTP error for URL {url}: {e}")
+        status_code = e.response.status_code if e.response is not None else None
+        if status_code == 403:
+            raise FetchError("Access to the article was denied by the server.") from e
+        if status_code == 404:
+            raise FetchError("The requested article could not be found.") from e
+        raise FetchError("Failed to fetch the article due to a server error.") from e
+    except requests.exceptions.RequestException as e:
+        logging.exception(f"Error fetching URL {url}: {e}")
+        raise FetchError(
+            "Failed to fetch the article. Please check the URL and your connection."
+        ) from e
+    finally:
+        metrics.FETCH_SECONDS.observe(time.perf_counter() - started)
+        metrics.FETCH_BYTES.inc(total_size)
+
+
+def extract_article(raw_content: bytes) -> tuple[str, str]:
+    """Parse a downloaded page into its raw title and visible text."""
+    from bs4 import BeautifulSoup
+
+    with metrics.PARSE_SECONDS.time():
+        soup = BeautifulSoup(raw_content, "html.parser")
+        og_title = soup.find("meta", property="og:title")
+        if og_title and og_title.get("content"):
+            title = og_title["content"]
+        else:
+            title = soup.title.string if soup.title else ""
+        return title or "", soup.get_text(separator=" ", strip=True)
+
+
+def clean_article(raw_title: str, raw_text: str) -> tuple[str, str]:
+    """Clean an extracted title and body, rejecting short or garbled content."""
+    content = clean_text(raw_text)
+    if len(content) < 100:
+        raise FetchError(
+            "Content could not be properly extracted or is too short after cleaning."
+        )
+    non_alphanumeric_count = len(re.findall("[^A-Za-z0-9\\s]", content))
+    if non_alphanumeric_count / len(content) > 0.5:
+        raise FetchError(
+            "The extracted content appears to be mostly special characters or is garbled."
+        )
+    title = clean_text(raw_title)
+    if not title:
+        title = " ".join(content.split()[:10])
+    return title[:100], content
@@ -0,0 +1,67 @@
+"""Check that web-facing modules import quickly and without the NLP/scraping stack.
+
+Run with ``python -m app.utils.import_budget``; exits non-zero when over budget.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+DEFAULT_MODULES = ("app.states.article_state", "app.api.routes")
+DEFAULT_BUDGET_MS = 1500.0
+HEAVY_MODULES = ("requests", "bs4", "nltk", "sumy", "numpy", "scipy", "transformers")
+
+
+def measure(module: str) -> tuple[float, set[str]]:
+    """Import ``module`` in a fresh interpreter under ``-X importtime``.
+
+    Returns the cumulative import time and the top-level names in ``sys.modules``.
+    """
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"import sys, {module}; print('\\n'.join(sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        cwd=os.getcwd(),
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    total_us = 0
+    imported = {name.split(".")[0] for name in result.stdout.split()}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        if not name.rstrip().startswith("  "):
+            total_us += int(cumulative)
+    return total_us / 1000, imported
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=list(DEFAULT_MODULES))
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    args = parser.parse_args(argv)
+    failed = False
+    for module in args.modules:
+        elapsed_ms, imported = measure(module)
+        heavy = sorted(imported.intersection(HEAVY_MODULES))
+        over_budget = elapsed_ms > args.budget_ms
+        failed = failed or over_budget or bool(heavy)
+        print(
+            f"{module}: {elapsed_ms:.1f} ms (budget {args.budget_ms:.0f} ms)"
+            + (f", eagerly imports {', '.join(heavy)}" if heavy else "")
+        )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+"""Retention, archival and compaction for the article store.
+
+Retention policies are opt-in through the environment (0, the default,
+disables a policy). Rows are appended to gzip-compressed NDJSON archives before
+their content is dropped or they are purged. Run ``python -m app.utils.maintenance
+run [--dry-run] [--vacuum]`` by hand, or let the ``run_maintenance`` lifespan task
+do it periodically; only the command line ever runs a full VACUUM.
+"""
+
+import argparse
+import asyncio
+import datetime
+import fcntl
+import gzip
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+import reflex as rx
+from sqlalchemy import bindparam, text
+from app.utils import article_cache, coordination, near_duplicates, related
+from app.utils.database import ensure_schema
+
+ARCHIVE_DIR = os.path.abspath(os.environ.get("SUMMARIZER_ARCHIVE_DIR", "archive"))
+RETAIN_CONTENT_DAYS = int(os.environ.get("SUMMARIZER_RETAIN_CONTENT_DAYS", "0"))
+PURGE_FAILED_DAYS = int(os.environ.get("SUMMARIZER_PURGE_FAILED_DAYS", "0"))
+CACHE_RETENTION_DAYS = int(os.environ.get("SUMMARIZER_CACHE_RETENTION_DAYS", "30"))
+INTERVAL_SECONDS = float(os.environ.get("SUMMARIZER_MAINTENANCE_INTERVAL", "21600"))
+STARTUP_DELAY_SECONDS = 300
+BATCH_SIZE = 200
+VACUUM_PAGES_PER_STEP = 2000
+MAX_VACUUM_STEPS = 50
+ANALYSIS_LIMIT = 1000
+ARCHIVE_COLUMNS = "id, url, title, status, summary, content, error_message, duplicate_of, created_at, updated_at"
+_AGE_CONDITION = "datetime(COALESCE(updated_at, created_at)) < datetime(:cutoff)"
+_POLICIES = {
+    "content": (
+        RETAIN_CONTENT_DAYS,
+        f"status = 'completed' AND content IS NOT NULL AND {_AGE_CONDITION}",
+    ),
+    "failed": (PURGE_FAILED_DAYS, f"status = 'failed' AND {_AGE_CONDITION}"),
+}
+
+_lock = threading.Lock()
+
+
+def _cutoff(days: int) -> str:
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return (now - datetime.timedelta(days=days)).isoformat()
+
+
+def _archive(policy: str, rows: list) -> str:
+    """Append rows to this month's archive as one gzip member, fsynced before returning."""
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    path = os.path.join(
+        ARCHIVE_DIR, f"articles-{time.strftime('%Y-%m', time.gmtime())}.ndjson.gz"
+    )
+    archived_at = time.time()
+    with open(path, "ab") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb") as archive:
+            for row in rows:
+                record = dict(row._mapping)
+                record["created_at"] = str(record["created_at"] or "")
+                record["archived_at"] = archived_at
+                record["policy"] = policy
+                archive.write(json.dumps(record, ensure_ascii=False).encode("utf-8"))
+                archive.write(b"\n")
+        raw.flush()
+        os.fsync(raw.fileno())
+    return path
+
+
+@contextmanager
+def _archive_lock():
+    """Hold an exclusive lock on the archive directory, shared with other processes."""
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    with open(os.path.join(ARCHIVE_DIR, ".maintenance.lock"), "a") as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _apply(policy: str, article_ids: list[int]) -> None:
+    if policy == "content":
+        statement = "UPDATE article SET content = NULL, sentence_offsets = NULL WHERE id IN :ids"
+    else:
+        statement = "DELETE FROM article WHERE id IN :ids"
+    with rx.session() as session:
+        session.execute(
+            text(statement).bindparams(bindparam("ids", expanding=True)),
+            params={"ids": article_ids},
+        )
+        session.commit()
+    if policy == "failed":
+        near_duplicates.forget(*article_ids)
+        for article_id in article_ids:
+            related.forget(article_id)
+    article_cache.refresh(*article_ids)
+
+
+def enforce(policy: str, dry_run: bool = False) -> int:
+    """Archive and apply one retention policy in batches; returns the rows affected."""
+    days, condition = _POLICIES[policy]
+    if days <= 0:
+        return 0
+    cutoff = _cutoff(days)
+    affected = 0
+    last_id = 0
+    while True:
+        with rx.session() as session:
+            rows = session.execute(
+                text(
+                    f"SELECT {ARCHIVE_COLUMNS} FROM article WHERE id > :last_id AND {condition} ORDER BY id LIMIT :limit"
+                ),
+                params={"last_id": last_id, "cutoff": cutoff, "limit": BATCH_SIZE},
+            ).all()
+        if not rows:
+            return affected
+        last_id = rows[-1][0]
+        affected += len(rows)
+        if not dry_run:
+            _archive(policy, rows)
+            _apply(policy, [row[0] for row in rows])
+
+
+def trim_caches(dry_run: bool = False) -> int:
+    """Drop cached sentence scores and summaries not written for a while."""
+    if CACHE_RETENTION_DAYS <= 0:
+        return 0
+    cutoff = time.time() - CACHE_RETENTION_DAYS * 86400
+    removed = 0
+    with rx.session() as session:
+        for table in ("sentence_scores", "summary_cache"):
+            verb = "SELECT COUNT(*)" if dry_run else "DELETE"
+            result = session.execute(
+                text(f"{verb} FROM {table} WHERE created_at < :cutoff"),
+                params={"cutoff": cutoff},
+            )
+            removed += result.scalar_one() if dry_run else result.rowcount
+        session.commit()
+    return removed
+
+
+def compact(vacuum: bool = False) -> dict:
+    """Return free pages to the OS with incremental vacuum, then refresh planner stats.
+
+    Incremental vacuum needs a one-off full VACUUM to switch modes, which locks
+    the database for its whole run, so it only happens when ``vacuum`` is set.
+    """
+    from reflex.model import get_engine
+
+    with get_engine().connect().execution_options(
+        isolation_level="AUTOCOMMIT"
+    ) as connection:
+        incremental = connection.execute(text("PRAGMA auto_vacuum")).scalar_one() == 2
+        if not incremental and vacuum:
+            logging.info("Switching the database to incremental auto-vacuum (one-off VACUUM)")
+            connection.execute(text("PRAGMA auto_vacuum = INCREMENTAL"))
+            connection.execute(text("VACUUM"))
+            incremental = True
+        elif not incremental:
+            logging.info(
+                "Incremental vacuum is off; run `python -m app.utils.maintenance run --vacuum` to enable it"
+            )
+        free_before = connection.execute(text("PRAGMA freelist_count")).scalar_one()
+        for _ in range(MAX_VACUUM_STEPS if incremental else 0):
+            if not connection.execute(text("PRAGMA freelist_count")).scalar_one():
+                break
+            connection.execute(
+                text(f"PRAGMA incremental_vacuum({VACUUM_PAGES_PER_STEP})")
+            ).fetchall()
+        connection.execute(text(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT}"))
+        connection.execute(text("ANALYZE"))
+        free_after = connection.execute(text("PRAGMA freelist_count")).scalar_one()
+    return {"pages_freed": free_before - free_after, "free_pages": free_after}
+
+
+def run_once(dry_run: bool = False, vacuum: bool = False) -> dict:
+    """Apply every retention policy, trim caches and compact the database."""
+    ensure_schema()
+    with _lock:
+        archiving = not dry_run and any(days > 0 for days, _ in _POLICIES.values())
+        with _archive_lock() if archiving else nullcontext():
+            report = {policy: enforce(policy, dry_run) for policy in _POLICIES}
+        report["cache_rows"] = trim_caches(dry_run)
+        if not dry_run:
+            report.update(compact(vacuum))
+    return report
+
+
+async def _run_periodically() -> None:
+    await asyncio.sleep(STARTUP_DELAY_SECONDS)
+    while True:
+        try:
+            report = await asyncio.to_thread(run_once)
+            logging.info(f"Maintenance finished: {report}")
+        except Exception as e:
+            logging.exception(f"Maintenance run failed: {e}")
+        await asyncio.sleep(INTERVAL_SECONDS)
+
+
+async def run_maintenance() -> None:
+    """Run maintenance periodically until cancelled, in one process only; an app lifespan task."""
+    await coordination.run_as_leader("maintenance", _run_periodically)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=["run"])
+    parser.add_argument(
+        "--dry-run", action="store_true", help="count affected rows without changing anything"
+    )
+    parser.add_argument(
+        "--vacuum",
+        action="store_true",
+        help="allow the one-off full VACUUM that enables incremental vacuum",
+    )
+    args = parser.parse_args(argv)
+    print(json.dumps(run_once(args.dry_run, args.vacuum)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,295 @@
+import bisect
+import re
+import threading
+import time
+from collections.abc import Callable
+from contextlib import contextmanager
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+BYTES_BUCKETS = tuple(2**power for power in range(10, 24, 2))
+
+_registry: list["_Metric"] = []
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels: dict) -> tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        header = f"# HELP {self.name} {self.documentation}\n# TYPE {self.name} {self.kind}\n"
+        return header + "".join(line + "\n" for line in self.samples())
+
+
+class Counter(_Metric):
+    """A monotonically increasing value, e.g. bytes downloaded."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in values
+        ]
+
+
+class Gauge(_Metric):
+    """A value that goes up and down, optionally computed at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._functions: dict[tuple[str, ...], Callable[[], float]] = {}
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set_function(self, function: Callable[[], float], **labels) -> None:
+        """Compute the value lazily on each scrape instead of on the hot path."""
+        with self._lock:
+            self._functions[self._key(labels)] = function
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = dict(self._values)
+            functions = list(self._functions.items())
+        for key, function in functions:
+            try:
+                values[key] = float(function())
+            except Exception:
+                continue
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in values.items()
+        ]
+
+
+class Histogram(_Metric):
+    """Bucketed observations such as latencies, with running sum and count."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 3)
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            series = {key: list(values) for key, values in self._series.items()}
+        lines = []
+        for key, values in series.items():
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), values):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {_format_value(cumulative)}"
+                )
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(values[-2])}")
+            lines.append(f"{self.name}_count{labels} {_format_value(values[-1])}")
+        return lines
+
+
+def render() -> str:
+    """Render every registered metric in the Prometheus text exposition format."""
+    return "".join(metric.render() for metric in _registry)
+
+
+FETCH_SECONDS = Histogram(
+    "summarizer_fetch_seconds", "Time spent downloading article bodies."
+)
+FETCH_BYTES = Counter(
+    "summarizer_fetch_bytes_total", "Bytes downloaded from article URLs."
+)
+FETCH_BODY_BYTES = Histogram(
+    "summarizer_fetch_body_bytes", "Size of downloaded article bodies.", buckets=BYTES_BUCKETS
+)
+FETCH_CACHE_RESULTS = Counter(
+    "summarizer_fetch_cache_results_total",
+    "Conditional fetch outcomes: hit (304 reused), miss or refetched.",
+    ("result",),
+)
+PARSE_SECONDS = Histogram(
+    "summarizer_parse_seconds", "Time spent parsing HTML into title and text."
+)
+CLEAN_TEXT_SECONDS = Histogram(
+    "summarizer_clean_text_seconds", "Time spent in clean_text."
+)
+SUMMARIZE_SECONDS = Histogram(
+    "summarizer_summarize_seconds",
+    "Time spent producing a summary, by algorithm.",
+    ("algorithm",),
+)
+SUMMARY_CACHE_RESULTS = Counter(
+    "summarizer_summary_cache_results_total",
+    "Summary cache lookups by the tier that answered them.",
+    ("result",),
+)
+NEAR_DUPLICATE_RESULTS = Counter(
+    "summarizer_near_duplicate_results_total",
+    "Ingested articles linked to a near-duplicate's summary, or unique.",
+    ("result",),
+)
+STAGE_RESULTS = Counter(
+    "summarizer_stage_results_total",
+    "Articles leaving each pipeline stage, by outcome.",
+    ("stage", "outcome"),
+)
+QUEUE_DEPTH = Gauge(
+    "summarizer_queue_depth", "Articles waiting or in flight, by status.", ("status",)
+)
+STAGE_QUEUE_DEPTH = Gauge(
+    "summarizer_stage_queue_depth",
+    "Items buffered between in-memory pipeline stages.",
+    ("stage",),
+)
+QUEUE_WAIT_SECONDS = Histogram(
+    "summarizer_queue_wait_seconds",
+    "Time an article waited before a stage picked it up.",
+    ("stage",),
+    buckets=DEFAULT_BUCKETS + (120.0, 300.0, 900.0, 3600.0),
+)
+TIME_TO_SUMMARY_SECONDS = Histogram(
+    "summarizer_time_to_summary_seconds",
+    "Time from submission to a stored summary, by priority class.",
+    ("priority",),
+    buckets=DEFAULT_BUCKETS + (120.0, 300.0, 900.0, 3600.0),
+)
+DB_QUERY_SECONDS = Histogram(
+    "summarizer_db_query_seconds", "Database statement latency.", ("statement",)
+)
+ACTIVE_STATES = Gauge(
+    "summarizer_active_websocket_states", "Connected client sessions."
+)
+
+_STATEMENT_VERB = re.compile("^\\s*(\\w+)")
+_STATEMENT_TABLE = re.compile(
+    "\\b(?:FROM|INTO|UPDATE|TABLE)\\s+(\\w+)", re.IGNORECASE
+)
+_sqlalchemy_instrumented = False
+
+
+def _statement_label(statement: str) -> str:
+    verb = _STATEMENT_VERB.match(statement)
+    table = _STATEMENT_TABLE.search(statement)
+    label = verb.group(1).lower() if verb else "unknown"
+    return f"{label} {table.group(1).lower()}" if table else label
+
+
+def instrument_sqlalchemy() -> None:
+    """Record the latency of every SQL statement, labelled by verb and table."""
+    global _sqlalchemy_instrumented
+    if _sqlalchemy_instrumented:
+        return
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    @event.listens_for(Engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context.query_started = time.perf_counter()
+
+    @event.listens_for(Engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "query_started", None)
+        if started is None:
+            return
+        DB_QUERY_SECONDS.observe(
+            time.perf_counter() - started, statement=_statement_label(statement)
+        )
+
+    _sqlalchemy_instrumented = True
@@ -0,0 +1,173 @@
+"""MinHash signatures and LSH buckets for spotting syndicated copies at ingest.
+
+Run ``python -m app.utils.near_duplicates backfill`` once to index older articles.
+"""
+
+import hashlib
+import sys
+import zlib
+import reflex as rx
+from sqlalchemy import bindparam, text
+
+SHINGLE_WORDS = 5
+NUM_PERMUTATIONS = 128
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+SIMILARITY_THRESHOLD = 0.85
+HASH_BLOCK = 4096
+BACKFILL_BATCH = 500
+_MERSENNE_PRIME = (1 << 61) - 1
+_SEED = 20240611
+
+_permutations = None
+
+
+def _coefficients():
+    global _permutations
+    if _permutations is None:
+        import numpy
+
+        rng = numpy.random.default_rng(_SEED)
+        _permutations = (
+            rng.integers(1, 1 << 32, NUM_PERMUTATIONS, dtype=numpy.uint64)[:, None],
+            rng.integers(0, 1 << 32, NUM_PERMUTATIONS, dtype=numpy.uint64)[:, None],
+        )
+    return _permutations
+
+
+def _shingle_hashes(cleaned_text: str):
+    import numpy
+
+    words = cleaned_text.lower().split()
+    width = min(SHINGLE_WORDS, len(words)) or 1
+    hashes = [
+        zlib.crc32(" ".join(words[index : index + width]).encode("utf-8"))
+        for index in range(max(1, len(words) - width + 1))
+    ]
+    return numpy.unique(numpy.array(hashes, dtype=numpy.uint64))
+
+
+def signature(cleaned_text: str) -> bytes:
+    """Return the text's MinHash signature as packed uint32 values."""
+    import numpy
+
+    a, b = _coefficients()
+    hashes = _shingle_hashes(cleaned_text)
+    minimums = numpy.full(NUM_PERMUTATIONS, 0xFFFFFFFF, dtype=numpy.uint64)
+    for start in range(0, len(hashes), HASH_BLOCK):
+        block = hashes[start : start + HASH_BLOCK][None, :]
+        permuted = ((a * block + b) % _MERSENNE_PRIME) & 0xFFFFFFFF
+        numpy.minimum(minimums, permuted.min(axis=1), out=minimums)
+    return minimums.astype(numpy.uint32).tobytes()
+
+
+def similarity(first: bytes, second: bytes) -> float:
+    """Estimate the Jaccard similarity of two texts from their signatures."""
+    import numpy
+
+    if len(first) != len(second):
+        return 0.0
+    left = numpy.frombuffer(first, dtype=numpy.uint32)
+    right = numpy.frombuffer(second, dtype=numpy.uint32)
+    return float(numpy.count_nonzero(left == right)) / len(left)
+
+
+def _band_keys(packed_signature: bytes) -> list[int]:
+    band_bytes = ROWS_PER_BAND * 4
+    keys = []
+    for band in range(BANDS):
+        digest = hashlib.blake2b(
+            packed_signature[band * band_bytes : (band + 1) * band_bytes],
+            digest_size=8,
+            person=band.to_bytes(2, "big"),
+        ).digest()
+        keys.append(int.from_bytes(digest, "big") & 0x7FFFFFFFFFFFFFFF)
+    return keys
+
+
+def find_duplicate(
+    packed_signature: bytes, exclude_id: int | None = None
+) -> tuple[int, str, int | None, float] | None:
+    """Find the most similar summarized article sharing an LSH bucket, above the threshold.
+
+    Returns ``(article_id, summary, summary_sentences, similarity)``.
+    """
+    with rx.session() as session:
+        candidates = session.execute(
+            text(
+                "SELECT DISTINCT a.id, a.summary, a.summary_sentences, s.signature FROM lsh_bucket b JOIN minhash_signature s ON s.article_id = b.article_id JOIN article a ON a.id = b.article_id WHERE b.band_key IN :keys AND a.status = 'completed' AND a.summary IS NOT NULL AND a.duplicate_of IS NULL"
+            ).bindparams(bindparam("keys", expanding=True)),
+            params={"keys": _band_keys(packed_signature)},
+        ).all()
+    best = None
+    for article_id, summary, summary_sentences, candidate in candidates:
+        if article_id == exclude_id:
+            continue
+        score = similarity(packed_signature, bytes(candidate))
+        if score >= SIMILARITY_THRESHOLD and (best is None or score > best[3]):
+            best = (article_id, summary, summary_sentences, score)
+    return best
+
+
+def index(article_id: int, packed_signature: bytes) -> None:
+    """Store an article's signature and add it to its LSH buckets."""
+    with rx.session() as session:
+        session.execute(
+            text(
+                "INSERT OR REPLACE INTO minhash_signature (article_id, signature) VALUES (:id, :signature)"
+            ),
+            params={"id": article_id, "signature": packed_signature},
+        )
+        session.execute(
+            text("DELETE FROM lsh_bucket WHERE article_id = :id"), params={"id": article_id}
+        )
+        for key in _band_keys(packed_signature):
+            session.execute(
+                text(
+                    "INSERT OR IGNORE INTO lsh_bucket (band_key, article_id) VALUES (:key, :id)"
+                ),
+                params={"key": key, "id": article_id},
+            )
+        session.commit()
+
+
+def forget(*article_ids: int) -> None:
+    """Drop deleted articles from the index."""
+    if not article_ids:
+        return
+    with rx.session() as session:
+        for table in ("minhash_signature", "lsh_bucket"):
+            session.execute(
+                text(f"DELETE FROM {table} WHERE article_id IN :ids").bindparams(
+                    bindparam("ids", expanding=True)
+                ),
+                params={"ids": list(article_ids)},
+            )
+        session.commit()
+
+
+def backfill() -> int:
+    """Index every article with content that has no signature yet."""
+    from app.utils.database import ensure_schema
+
+    ensure_schema()
+    indexed = 0
+    while True:
+        with rx.session() as session:
+            rows = session.execute(
+                text(
+                    "SELECT id, content FROM article WHERE content IS NOT NULL AND id NOT IN (SELECT article_id FROM minhash_signature) LIMIT :limit"
+                ),
+                params={"limit": BACKFILL_BATCH},
+            ).all()
+        if not rows:
+            return indexed
+        for article_id, content in rows:
+            index(article_id, signature(content))
+        indexed += len(rows)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["backfill"]:
+        sys.exit("usage: python -m app.utils.near_duplicates backfill")
+    print(f"Indexed {backfill()} articles")
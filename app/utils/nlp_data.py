@@ -0,0 +1,179 @@
+"""Vendor NLTK data locally and prewarm the summarizer so workers never hit the network.
+
+Usage: ``python -m app.utils.nlp_data vendor`` at build time, ``prewarm`` to check.
+Without vendored data summaries use plain sentence splits; set
+``SUMMARIZER_NLP_DOWNLOAD=1`` to let the first tokenizer call download it instead.
+"""
+
+import argparse
+import logging
+import os
+import pickle
+import sys
+import threading
+import time
+
+DATA_DIR = os.path.abspath(os.environ.get("SUMMARIZER_NLP_DATA", "nlp_data"))
+NLTK_RESOURCES = {"punkt": "tokenizers/punkt", "punkt_tab": "tokenizers/punkt_tab"}
+TOKENIZER_PICKLE = "sumy_tokenizer_english.pickle"
+LANGUAGE = "english"
+WARMUP_TEXT = (
+    "Offline bootstrap keeps the first summary fast. "
+    "The tokenizer and stemmer are loaded from the local data directory. "
+    "No network access is needed at runtime. "
+    "Workers warm these caches before claiming articles. "
+    "Summaries are then produced with the LSA algorithm."
+)
+
+MISSING_DATA_MESSAGE = "NLTK punkt data is missing; run `python -m app.utils.nlp_data vendor`."
+ALLOW_DOWNLOAD = os.environ.get("SUMMARIZER_NLP_DOWNLOAD", "").lower() in ("1", "true", "yes")
+RECHECK_SECONDS = 60
+DOWNLOAD_RETRY_SECONDS = 600
+
+_lock = threading.Lock()
+_tokenizer = None
+_unavailable = MISSING_DATA_MESSAGE
+_unavailable_until = float("-inf")
+_downloading = False
+_fallback_reported = False
+
+
+def _use_local_data() -> None:
+    import nltk
+
+    if DATA_DIR not in nltk.data.path:
+        nltk.data.path.insert(0, DATA_DIR)
+
+
+def _missing_resources() -> list[str]:
+    import nltk
+
+    missing = []
+    for name, path in NLTK_RESOURCES.items():
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            missing.append(name)
+    return missing
+
+
+def vendor() -> str:
+    """Download NLTK resources into DATA_DIR and pickle a ready-to-use tokenizer."""
+    import nltk
+
+    os.makedirs(DATA_DIR, exist_ok=True)
+    _use_local_data()
+    for name in NLTK_RESOURCES:
+        if not nltk.download(name, download_dir=DATA_DIR, quiet=True):
+            logging.warning(f"NLTK resource {name} could not be downloaded")
+    from sumy.nlp.tokenizers import Tokenizer
+
+    tokenizer = Tokenizer(LANGUAGE)
+    path = os.path.join(DATA_DIR, TOKENIZER_PICKLE)
+    with open(path + ".tmp", "wb") as f:
+        pickle.dump(tokenizer, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(path + ".tmp", path)
+    return DATA_DIR
+
+
+def _load_pickled():
+    path = os.path.join(DATA_DIR, TOKENIZER_PICKLE)
+    if not os.path.isfile(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except Exception as e:
+        logging.exception(f"Failed to load pickled tokenizer from {path}: {e}")
+        return None
+
+
+def _build_local():
+    """Build the tokenizer from local data only; ``None`` when no punkt data is there."""
+    _use_local_data()
+    loaded = _load_pickled()
+    if loaded is None:
+        if len(_missing_resources()) == len(NLTK_RESOURCES):
+            return None
+        from sumy.nlp.tokenizers import Tokenizer
+
+        loaded = Tokenizer(LANGUAGE)
+    return loaded
+
+
+def _mark_unavailable(message: str, seconds: float) -> LookupError:
+    global _unavailable, _unavailable_until
+    _unavailable, _unavailable_until = message, time.monotonic() + seconds
+    return LookupError(message)
+
+
+def tokenizer():
+    """Return the shared sumy tokenizer, built from local data.
+
+    Raises LookupError when the data is missing; the local data is looked for
+    again after a minute. Only with ``SUMMARIZER_NLP_DOWNLOAD`` set is it
+    downloaded, by one caller and outside the lock, while others keep failing fast.
+    """
+    global _tokenizer, _downloading
+    if _tokenizer is not None:
+        return _tokenizer
+    with _lock:
+        if _tokenizer is not None:
+            return _tokenizer
+        if time.monotonic() < _unavailable_until:
+            raise LookupError(_unavailable)
+        _tokenizer = _build_local()
+        if _tokenizer is not None:
+            return _tokenizer
+        if _downloading:
+            raise LookupError(f"{MISSING_DATA_MESSAGE} A download is in progress.")
+        if not ALLOW_DOWNLOAD:
+            raise _mark_unavailable(MISSING_DATA_MESSAGE, RECHECK_SECONDS)
+        _downloading = True
+    logging.warning(f"{MISSING_DATA_MESSAGE} Downloading it into {DATA_DIR}.")
+    error = None
+    try:
+        vendor()
+    except Exception as e:
+        error = e
+    with _lock:
+        _downloading = False
+        if error is None:
+            _tokenizer = _build_local()
+        if _tokenizer is None:
+            raise _mark_unavailable(
+                f"{MISSING_DATA_MESSAGE} Download failed: {error or 'no punkt data'}",
+                DOWNLOAD_RETRY_SECONDS,
+            )
+        return _tokenizer
+
+
+def report_fallback(error: LookupError) -> None:
+    """Log, once per process, that summaries fall back to plain sentence splitting."""
+    global _fallback_reported
+    if not _fallback_reported:
+        _fallback_reported = True
+        logging.error(f"Tokenizer unavailable, summarizing with plain sentence splits: {error}")
+
+
+def prewarm() -> float:
+    """Load the tokenizer and run one small summary so later calls skip setup."""
+    started = time.perf_counter()
+    from app.utils import document, summarizer
+
+    summarizer.warm_up(document.tokenize(WARMUP_TEXT))
+    return time.perf_counter() - started
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=["vendor", "prewarm"])
+    args = parser.parse_args(argv)
+    if args.command == "vendor":
+        print(f"Vendored NLP data into {vendor()}")
+    print(f"Prewarmed summarizer in {prewarm() * 1000:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
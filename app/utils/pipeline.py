@@ -0,0 +1,916 @@
+import asyncio
+import datetime
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+import reflex as rx
+from sqlalchemy import bindparam, text
+from app.utils import (
+    admission,
+    article_cache,
+    coordination,
+    document,
+    fetch_cache,
+    metrics,
+    near_duplicates,
+    nlp_data,
+    politeness,
+    profiler,
+    related,
+    summary_workers,
+)
+from app.utils.database import ensure_schema
+from app.utils.fetcher import (
+    FetchError,
+    FetchResult,
+    clean_article,
+    extract_article,
+    fetch_url,
+)
+from app.utils.rate_limiter import is_rate_limited
+from app.utils.summarizer import BATCH_MAX_WORDS, summarize_batch, summarize_text_lsa
+from app.utils.url_validator import is_safe_url, validate_url_format
+
+FETCH_WORKERS = 8
+EXTRACT_WORKERS = 2
+CLEAN_WORKERS = 2
+SUMMARIZE_WORKERS = 1
+SUMMARIZE_BATCH_SIZE = 16
+STAGE_QUEUE_SIZE = 16
+MAX_BATCH_SIZE = 100
+MAX_SUMMARY_SENTENCES = 20
+IDLE_POLL_SECONDS = 5.0
+ARTICLE_LEASE_SECONDS = 600
+INTERACTIVE_PRIORITY = 0
+RETRY_PRIORITY = 1
+BULK_PRIORITY = 2
+PRIORITY_CLASSES = {
+    INTERACTIVE_PRIORITY: "interactive",
+    RETRY_PRIORITY: "retry",
+    BULK_PRIORITY: "bulk",
+}
+MAX_TRACKED_CLIENTS = 10000
+CLAIM_COLUMNS = "id, url, content, updated_at, stage_timings, summary_sentences, sentence_offsets, word_count, priority, created_at"
+_QUEUE_HEADS_QUERY = """
+WITH turns AS (
+    SELECT id, url, priority, client, created_at,
+        ROW_NUMBER() OVER (PARTITION BY priority, COALESCE(client, '') ORDER BY created_at, id) AS client_turn
+    FROM article WHERE status = :status
+)
+SELECT id, COALESCE(client, ''), created_at, url, priority FROM turns
+WHERE client_turn = 1
+"""
+_CLAIM_BATCH_QUERY = f"""
+WITH turns AS (
+    SELECT id, priority, created_at, COALESCE(word_count, 0) AS words,
+        ROW_NUMBER() OVER (PARTITION BY priority, COALESCE(client, '') ORDER BY COALESCE(word_count, 0), created_at, id) AS client_turn
+    FROM article WHERE status = 'pending'
+), ranked AS (
+    SELECT id, words, ROW_NUMBER() OVER (ORDER BY client_turn, created_at, id) AS position
+    FROM turns WHERE priority = (SELECT MIN(priority) FROM turns)
+)
+UPDATE article SET status = 'processing', updated_at = :now, lease_owner = :owner, lease_expires = :expires
+WHERE status = 'pending' AND id IN (
+    SELECT id FROM ranked WHERE position <= :limit AND (words <= :max_words OR position = 1)
+)
+RETURNING {CLAIM_COLUMNS}
+"""
+
+_loop: asyncio.AbstractEventLoop | None = None
+_wakeups: dict[str, asyncio.Event] = {}
+_last_served: dict[str, OrderedDict[str, float]] = {}
+_held: set[int] = set()
+
+
+class SubmissionError(Exception):
+    """A URL was rejected before it was queued; the message is user-facing."""
+
+
+class RateLimitedError(SubmissionError):
+    """The client has submitted too many URLs recently."""
+
+
+class ArticleBusyError(SubmissionError):
+    """The article is still moving through the pipeline."""
+
+
+class QueueFullError(SubmissionError):
+    """The backlog is too deep to accept more work right now."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _queue_full(retry_after: float) -> QueueFullError:
+    return QueueFullError(
+        f"The queue is full. Please try again in {admission.describe_wait(retry_after)}.",
+        retry_after,
+    )
+
+
+def _admit(count: int, bulk: bool) -> None:
+    retry_after = admission.precheck(count, bulk)
+    if retry_after is not None:
+        raise _queue_full(retry_after)
+
+
+def stage_workers() -> dict[str, int]:
+    """Number of workers each stage runs per pipeline process."""
+    return {
+        "fetch": FETCH_WORKERS,
+        "extract": EXTRACT_WORKERS,
+        "clean": CLEAN_WORKERS,
+        "summarize": max(SUMMARIZE_WORKERS, summary_workers.PROCESSES),
+    }
+
+
+def _now_iso() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+
+def _seconds_since(timestamp: str | None) -> float | None:
+    if not timestamp:
+        return None
+    try:
+        then = datetime.datetime.fromisoformat(str(timestamp))
+    except ValueError:
+        return None
+    if then.tzinfo is None:
+        then = then.replace(tzinfo=datetime.timezone.utc)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return round(max(0.0, (now - then).total_seconds()), 4)
+
+
+def _observe_wait(stage: str, seconds: float | None) -> None:
+    if seconds is not None:
+        metrics.QUEUE_WAIT_SECONDS.observe(seconds, stage=stage)
+
+
+def _observe_time_to_summary(priority: int | None, created_at: str | None) -> None:
+    seconds = _seconds_since(created_at)
+    if seconds is not None:
+        metrics.TIME_TO_SUMMARY_SECONDS.observe(
+            seconds, priority=PRIORITY_CLASSES.get(priority, "interactive")
+        )
+
+
+def _elapsed(started: float) -> float:
+    return round(time.perf_counter() - started, 4)
+
+
+def _wake(stage: str) -> None:
+    """Wake the idle workers of a stage; safe to call from any thread."""
+    event = _wakeups.get(stage)
+    if event is None or _loop is None or _loop.is_closed():
+        return
+    _loop.call_soon_threadsafe(event.set)
+
+
+def _checked_url(url: str) -> str:
+    url = (url or "").strip()
+    if not url:
+        raise SubmissionError("URL is required.")
+    if len(url) > 2048:
+        raise SubmissionError("URL is too long (max 2048 characters).")
+    format_error = validate_url_format(url)
+    if format_error:
+        raise SubmissionError(format_error)
+    return url
+
+
+def _insert_queued(urls: list[str], priority: int, client: str) -> list[int]:
+    """Insert queued articles, atomically rejecting them all if the backlog is full."""
+    ensure_schema()
+    now = _now_iso()
+    with rx.session() as session:
+        article_ids = [
+            session.execute(
+                text(
+                    "INSERT INTO article (url, title, status, priority, client, created_at, updated_at) VALUES (:url, :title, 'queued', :priority, :client, :now, :now) RETURNING id"
+                ),
+                params={
+                    "url": url,
+                    "title": url[:100],
+                    "priority": priority,
+                    "client": client,
+                    "now": now,
+                },
+            ).scalar_one()
+            for url in urls
+        ]
+        retry_after = admission.check(session, priority != INTERACTIVE_PRIORITY)
+        if retry_after is not None:
+            session.rollback()
+            raise _queue_full(retry_after)
+        session.commit()
+    article_cache.refresh(*article_ids)
+    _wake("fetch")
+    return article_ids
+
+
+def submit_article(url: str, client_ip: str) -> int:
+    """Validate a URL without network access and insert it as a queued article."""
+    url = (url or "").strip()
+    if not url:
+        raise SubmissionError("URL is required.")
+    _admit(1, bulk=False)
+    if is_rate_limited(client_ip):
+        raise RateLimitedError("Rate limit exceeded. Please try again in an hour.")
+    return _insert_queued([_checked_url(url)], INTERACTIVE_PRIORITY, client_ip)[0]
+
+
+def submit_articles(urls: list[str], client_ip: str) -> list[dict]:
+    """Queue a batch of URLs as one rate-limited submission, reporting per-URL results."""
+    if not urls:
+        raise SubmissionError("At least one URL is required.")
+    if len(urls) > MAX_BATCH_SIZE:
+        raise SubmissionError(f"Too many URLs (max {MAX_BATCH_SIZE} per batch).")
+    _admit(len(urls), bulk=True)
+    if is_rate_limited(client_ip):
+        raise RateLimitedError("Rate limit exceeded. Please try again in an hour.")
+    results = []
+    accepted = []
+    for url in urls:
+        try:
+            checked = _checked_url(url if isinstance(url, str) else "")
+        except SubmissionError as e:
+            results.append({"url": url, "id": None, "error": str(e)})
+            continue
+        results.append({"url": checked, "id": None, "error": None})
+        accepted.append(results[-1])
+    if accepted:
+        article_ids = _insert_queued(
+            [result["url"] for result in accepted], BULK_PRIORITY, client_ip
+        )
+        for result, article_id in zip(accepted, article_ids):
+            result["id"] = article_id
+    return results
+
+
+def submit_discovered(urls: list[str], source: str) -> dict[str, int | None]:
+    """Queue URLs found by a crawler as bulk work, skipping the per-IP rate limit.
+
+    Raises QueueFullError (nothing queued) when the backlog cannot take them all;
+    invalid URLs map to ``None``.
+    """
+    checked = {}
+    for url in urls:
+        try:
+            checked[url] = _checked_url(url)
+        except SubmissionError:
+            checked[url] = None
+    valid = [url for url in checked.values() if url is not None]
+    if not valid:
+        return checked
+    _admit(len(valid), bulk=True)
+    article_ids = iter(_insert_queued(valid, BULK_PRIORITY, source))
+    return {
+        url: next(article_ids) if checked_url is not None else None
+        for url, checked_url in checked.items()
+    }
+
+
+def retry_article(article_id: int) -> str | None:
+    """Requeue a failed article at the earliest stage that still has work to do.
+
+    Returns the article's status afterwards (unchanged unless it had failed), or
+    ``None`` if it does not exist.
+    """
+    with rx.session() as session:
+        status = session.execute(
+            text(
+                "UPDATE article SET status = CASE WHEN content IS NULL THEN 'queued' ELSE 'pending' END, priority = :priority, error_message = NULL, updated_at = :now WHERE id = :id AND status = 'failed' RETURNING status"
+            ),
+            params={"id": article_id, "priority": RETRY_PRIORITY, "now": _now_iso()},
+        ).scalar_one_or_none()
+        session.commit()
+        if status is None:
+            return session.execute(
+                text("SELECT status FROM article WHERE id = :id"),
+                params={"id": article_id},
+            ).scalar_one_or_none()
+    article_cache.refresh(article_id)
+    _wake("fetch" if status == "queued" else "summarize")
+    return status
+
+
+def resummarize_article(article_id: int, sentences_count: int | None) -> str | None:
+    """Regenerate a completed article's summary at a new length from its stored content."""
+    if sentences_count is not None and not 1 <= sentences_count <= MAX_SUMMARY_SENTENCES:
+        raise SubmissionError(
+            f"Summary length must be between 1 and {MAX_SUMMARY_SENTENCES} sentences."
+        )
+    with rx.session() as session:
+        row = session.execute(
+            text(
+                "SELECT content, status, sentence_offsets, word_count FROM article WHERE id = :id"
+            ),
+            params={"id": article_id},
+        ).first()
+    if row is None or not row[0]:
+        return None
+    content, status, packed_offsets, word_count = row
+    if status not in ("completed", "failed"):
+        raise ArticleBusyError("The article is still being processed.")
+    summary = _summarize(content, sentences_count, packed_offsets, word_count)
+    if not summary:
+        raise SubmissionError("Summarization returned empty result.")
+    with rx.session() as session:
+        session.execute(
+            text(
+                "UPDATE article SET status = 'completed', summary = :summary, summary_sentences = :sentences, error_message = NULL, updated_at = :now WHERE id = :id"
+            ),
+            params={
+                "id": article_id,
+                "summary": summary,
+                "sentences": sentences_count,
+                "now": _now_iso(),
+            },
+        )
+        session.commit()
+    article_cache.refresh(article_id)
+    try:
+        related.add(article_id)
+    except Exception as e:
+        logging.exception(f"Failed to index article {article_id} as related: {e}")
+    return summary
+
+
+def _next_head(from_status: str, heads: list) -> tuple[int, str]:
+    """Pick the queue head whose client was served least recently in this stage."""
+    served = _last_served.get(from_status, {})
+    article_id, client = min(
+        heads, key=lambda head: (served.get(head[1], 0.0), str(head[2] or ""))
+    )[:2]
+    return article_id, client
+
+
+def _mark_served(from_status: str, client: str) -> None:
+    served = _last_served.setdefault(from_status, OrderedDict())
+    served[client] = time.monotonic()
+    served.move_to_end(client)
+    while len(served) > MAX_TRACKED_CLIENTS:
+        served.popitem(last=False)
+
+
+def _claim(
+    from_status: str, to_status: str, available: Callable[[str], bool] | None = None
+):
+    """Move the next article in one status to the next, returning its row.
+
+    Higher priority classes go first; within a class clients take turns, so one
+    client's large import cannot starve another's single submission. Heads whose
+    URL ``available`` rejects are left queued for a later claim, and when a whole
+    class is rejected the next class gets its turn.
+    """
+    heads_query = text(_QUEUE_HEADS_QUERY)
+    with rx.session() as session:
+        while True:
+            heads = session.execute(heads_query, params={"status": from_status}).all()
+            if available is not None:
+                heads = [head for head in heads if available(head[3])]
+            if not heads:
+                return None
+            top = min(head[4] for head in heads)
+            article_id, client = _next_head(
+                from_status, [head for head in heads if head[4] == top]
+            )
+            row = session.execute(
+                text(f"SELECT {CLAIM_COLUMNS} FROM article WHERE id = :id"),
+                params={"id": article_id},
+            ).first()
+            claimed = session.execute(
+                text(
+                    "UPDATE article SET status = :to_status, updated_at = :now, lease_owner = :owner, lease_expires = :expires WHERE id = :id AND status = :from_status"
+                ),
+                params={
+                    "id": article_id,
+                    "to_status": to_status,
+                    "from_status": from_status,
+                    "now": _now_iso(),
+                    "owner": coordination.PROCESS_ID,
+                    "expires": time.time() + ARTICLE_LEASE_SECONDS,
+                },
+            )
+            session.commit()
+            if claimed.rowcount and row is not None:
+                _mark_served(from_status, client)
+                _held.add(article_id)
+                article_cache.refresh(article_id)
+                return row
+
+
+def _link_duplicate(article_id: int, packed_signature: bytes | None):
+    """Index the article and return a summarized near-duplicate of it, if any."""
+    if packed_signature is None:
+        return None
+    try:
+        duplicate = near_duplicates.find_duplicate(packed_signature, article_id)
+        near_duplicates.index(article_id, packed_signature)
+    except Exception as e:
+        logging.exception(f"Near-duplicate lookup failed for article {article_id}: {e}")
+        return None
+    metrics.NEAR_DUPLICATE_RESULTS.inc(result="linked" if duplicate else "unique")
+    return duplicate
+
+
+def _update_held(statement: str, params: dict, held_status: str) -> bool:
+    """Run a stage's final UPDATE only if this process still holds the article's claim."""
+    try:
+        with rx.session() as session:
+            updated = session.execute(
+                text(f"{statement} AND status = :held_status AND lease_owner = :owner"),
+                params={**params, "held_status": held_status, "owner": coordination.PROCESS_ID},
+            ).rowcount
+            session.commit()
+    finally:
+        _held.discard(params["id"])
+    if not updated:
+        logging.warning(
+            f"Article {params['id']} was reclaimed while {held_status}; dropping this result"
+        )
+    return bool(updated)
+
+
+def _store_content(
+    article_id: int,
+    title: str,
+    tokenized: document.TokenizedDocument,
+    packed_signature: bytes | None,
+    timings: dict,
+) -> None:
+    duplicate = _link_duplicate(article_id, packed_signature)
+    params = {
+        "id": article_id,
+        "title": title,
+        "content": tokenized.text,
+        "offsets": document.pack(tokenized),
+        "word_count": tokenized.word_count,
+        "now": _now_iso(),
+    }
+    if duplicate is None:
+        statement = "UPDATE article SET status = 'pending', title = :title, content = :content, sentence_offsets = :offsets, word_count = :word_count, duplicate_of = NULL, stage_timings = :timings, updated_at = :now WHERE id = :id"
+    else:
+        statement = "UPDATE article SET status = 'completed', title = :title, content = :content, sentence_offsets = :offsets, word_count = :word_count, duplicate_of = :duplicate_of, summary = :summary, summary_sentences = :sentences, error_message = NULL, stage_timings = :timings, updated_at = :now WHERE id = :id"
+        duplicate_of, params["summary"], params["sentences"], score = duplicate
+        params["duplicate_of"] = duplicate_of
+        timings["duplicate_of"] = duplicate_of
+        timings["similarity"] = round(score, 3)
+    params["timings"] = json.dumps(timings)
+    if not _update_held(statement, params, "fetching"):
+        return
+    metrics.STAGE_RESULTS.inc(stage="clean", outcome="ok")
+    article_cache.refresh(article_id)
+    if duplicate is None:
+        _wake("summarize")
+    else:
+        metrics.STAGE_RESULTS.inc(stage="summarize", outcome="duplicate")
+
+
+def _store_summary(article_id: int, summary: str, timings: dict) -> bool:
+    """Complete a summarized article; false if another process reclaimed it."""
+    stored = _update_held(
+        "UPDATE article SET status = 'completed', summary = :summary, stage_timings = :timings, updated_at = :now WHERE id = :id",
+        {
+            "id": article_id,
+            "summary": summary,
+            "timings": json.dumps(timings),
+            "now": _now_iso(),
+        },
+        "processing",
+    )
+    if stored:
+        metrics.STAGE_RESULTS.inc(stage="summarize", outcome="ok")
+        article_cache.refresh(article_id)
+    return stored
+
+
+def _store_failure(
+    article_id: int, stage: str, error_message: str, timings: dict
+) -> None:
+    stored = _update_held(
+        "UPDATE article SET status = 'failed', error_message = :error_message, stage_timings = :timings, updated_at = :now WHERE id = :id",
+        {
+            "id": article_id,
+            "error_message": error_message,
+            "timings": json.dumps(timings),
+            "now": _now_iso(),
+        },
+        "processing" if stage == "summarize" else "fetching",
+    )
+    if stored:
+        metrics.STAGE_RESULTS.inc(stage=stage, outcome="failed")
+        article_cache.refresh(article_id)
+
+
+def _fetch_safely(url: str, cached: fetch_cache.CachedPage | None) -> FetchResult:
+    validation_error = is_safe_url(url)
+    if validation_error:
+        raise FetchError(validation_error)
+    if cached is None:
+        result = fetch_url(url)
+    else:
+        result = fetch_url(url, cached.etag, cached.last_modified)
+    if result.not_modified and cached is None:
+        raise FetchError("Failed to fetch the article due to a server error.")
+    return result
+
+
+def _tokenize_and_sign(
+    content: str,
+) -> tuple[document.TokenizedDocument, bytes | None]:
+    tokenized = document.tokenize(content)
+    try:
+        packed_signature = near_duplicates.signature(content)
+    except Exception as e:
+        logging.exception(f"Failed to compute MinHash signature: {e}")
+        packed_signature = None
+    return tokenized, packed_signature
+
+
+def _clean_and_tokenize(
+    raw_title: str, raw_text: str
+) -> tuple[str, document.TokenizedDocument, bytes | None]:
+    title, content = clean_article(raw_title, raw_text)
+    return (title, *_tokenize_and_sign(content))
+
+
+def _summarize(
+    content: str,
+    sentences_count: int | None,
+    packed_offsets: bytes | None = None,
+    word_count: int | None = None,
+) -> str | None:
+    return summarize_text_lsa(
+        content,
+        sentences_count=sentences_count,
+        tokenized=document.unpack(content, packed_offsets, word_count),
+    )
+
+
+def _user_message(error: Exception, stage: str, article_id: int) -> str:
+    if isinstance(error, FetchError):
+        return str(error)
+    logging.exception(f"Unexpected error in {stage} stage for article {article_id}: {error}")
+    return "An unexpected error occurred while processing the article."
+
+
+async def _idle(stage: str) -> None:
+    event = _wakeups[stage]
+    try:
+        await asyncio.wait_for(event.wait(), IDLE_POLL_SECONDS)
+    except asyncio.TimeoutError:
+        pass
+    event.clear()
+
+
+def _wake_fetch() -> None:
+    _wake("fetch")
+
+
+async def _fetch_worker(extract_queue: asyncio.Queue) -> None:
+    while True:
+        try:
+            row = await asyncio.to_thread(_claim, "queued", "fetching", politeness.available)
+        except Exception as e:
+            logging.exception(f"Failed to claim an article for fetching: {e}")
+            await asyncio.sleep(IDLE_POLL_SECONDS)
+            continue
+        if row is None:
+            await _idle("fetch")
+            continue
+        article_id, url = row[0], row[1]
+        timings = {"fetch_wait": _seconds_since(row[3])}
+        _observe_wait("fetch", timings["fetch_wait"])
+        started = time.perf_counter()
+        try:
+            cached = await asyncio.to_thread(fetch_cache.lookup, url)
+            async with politeness.polite(url):
+                result = await asyncio.to_thread(
+                    profiler.run_profiled,
+                    "ingest.fetch",
+                    article_id,
+                    _fetch_safely,
+                    url,
+                    cached,
+                )
+        except Exception as e:
+            timings["fetch"] = _elapsed(started)
+            await asyncio.to_thread(
+                _store_failure,
+                article_id,
+                "fetch",
+                _user_message(e, "fetch", article_id),
+                timings,
+            )
+            continue
+        timings["fetch"] = _elapsed(started)
+        metrics.STAGE_RESULTS.inc(stage="fetch", outcome="ok")
+        if result.not_modified and cached is not None:
+            metrics.FETCH_CACHE_RESULTS.inc(result="hit")
+            timings["fetch_cache"] = "hit"
+            try:
+                await asyncio.to_thread(fetch_cache.touch, url)
+                tokenized, packed_signature = await asyncio.to_thread(
+                    _tokenize_and_sign, cached.content
+                )
+                await asyncio.to_thread(
+                    _store_content,
+                    article_id,
+                    cached.title,
+                    tokenized,
+                    packed_signature,
+                    timings,
+                )
+            except Exception as e:
+                await asyncio.to_thread(
+                    _store_failure,
+                    article_id,
+                    "clean",
+                    _user_message(e, "clean", article_id),
+                    timings,
+                )
+            continue
+        metrics.FETCH_CACHE_RESULTS.inc(result="miss" if cached is None else "refetched")
+        await extract_queue.put((article_id, url, result, timings))
+
+
+async def _extract_worker(
+    extract_queue: asyncio.Queue, clean_queue: asyncio.Queue
+) -> None:
+    while True:
+        article_id, url, fetched, timings = await extract_queue.get()
+        started = time.perf_counter()
+        try:
+            extracted = await asyncio.to_thread(
+                profiler.run_profiled,
+                "ingest.extract",
+                article_id,
+                extract_article,
+                fetched.body,
+            )
+        except Exception as e:
+            timings["extract"] = _elapsed(started)
+            await asyncio.to_thread(
+                _store_failure,
+                article_id,
+                "extract",
+                _user_message(e, "extract", article_id),
+                timings,
+            )
+            continue
+        timings["extract"] = _elapsed(started)
+        metrics.STAGE_RESULTS.inc(stage="extract", outcome="ok")
+        await clean_queue.put((article_id, url, fetched, extracted, timings))
+
+
+async def _clean_worker(clean_queue: asyncio.Queue) -> None:
+    while True:
+        article_id, url, fetched, (raw_title, raw_text), timings = await clean_queue.get()
+        started = time.perf_counter()
+        try:
+            title, tokenized, packed_signature = await asyncio.to_thread(
+                profiler.run_profiled,
+                "ingest.clean",
+                article_id,
+                _clean_and_tokenize,
+                raw_title,
+                raw_text,
+            )
+            timings["clean"] = _elapsed(started)
+            await asyncio.to_thread(
+                _store_content, article_id, title, tokenized, packed_signature, timings
+            )
+        except Exception as e:
+            timings["clean"] = _elapsed(started)
+            await asyncio.to_thread(
+                _store_failure,
+                article_id,
+                "clean",
+                _user_message(e, "clean", article_id),
+                timings,
+            )
+            continue
+        try:
+            await asyncio.to_thread(
+                fetch_cache.store,
+                url,
+                fetched.etag,
+                fetched.last_modified,
+                title,
+                tokenized.text,
+            )
+        except Exception as e:
+            logging.exception(f"Failed to cache fetched page for {url}: {e}")
+
+
+def _claim_summary_batch() -> list:
+    """Claim up to a batch of pending articles in one statement.
+
+    Clients take turns within the batch, each contributing its shortest articles
+    first; an article too long to batch is only claimed when it heads the batch.
+    """
+    with rx.session() as session:
+        rows = session.execute(
+            text(_CLAIM_BATCH_QUERY),
+            params={
+                "now": _now_iso(),
+                "owner": coordination.PROCESS_ID,
+                "expires": time.time() + ARTICLE_LEASE_SECONDS,
+                "limit": SUMMARIZE_BATCH_SIZE,
+                "max_words": BATCH_MAX_WORDS,
+            },
+        ).all()
+        session.commit()
+    if rows:
+        _held.update(row[0] for row in rows)
+        article_cache.refresh(*(row[0] for row in rows))
+    return sorted(rows, key=lambda row: (row[7] or 0, row[0]))
+
+
+def _summarize_rows(rows: list) -> list[str | None]:
+    return summarize_batch(
+        [(row[2], document.unpack(row[2], row[6], row[7]), row[5]) for row in rows]
+    )
+
+
+async def _summarize_worker() -> None:
+    while True:
+        try:
+            rows = await asyncio.to_thread(_claim_summary_batch)
+        except Exception as e:
+            logging.exception(f"Failed to claim articles for summarization: {e}")
+            await asyncio.sleep(IDLE_POLL_SECONDS)
+            continue
+        if not rows:
+            await _idle("summarize")
+            continue
+        all_timings = []
+        for row in rows:
+            timings = json.loads(row[4]) if row[4] else {}
+            timings["summarize_wait"] = _seconds_since(row[3])
+            _observe_wait("summarize", timings["summarize_wait"])
+            all_timings.append(timings)
+        started = time.perf_counter()
+        try:
+            summaries = await asyncio.to_thread(
+                profiler.run_profiled,
+                "summarize",
+                [row[0] for row in rows],
+                _summarize_rows,
+                rows,
+            )
+        except Exception as e:
+            logging.exception(f"Failed to summarize a batch of {len(rows)} articles: {e}")
+            summaries = [e] * len(rows)
+        elapsed = _elapsed(started)
+        for row, timings, summary in zip(rows, all_timings, summaries):
+            article_id = row[0]
+            timings["summarize"] = elapsed
+            if len(rows) > 1:
+                timings["summarize_batch"] = len(rows)
+            try:
+                if isinstance(summary, Exception):
+                    raise summary
+                if not summary:
+                    raise ValueError("Summarization returned empty result.")
+                if not await asyncio.to_thread(_store_summary, article_id, summary, timings):
+                    continue
+                _observe_time_to_summary(row[8], row[9])
+            except Exception as e:
+                logging.exception(f"Failed to summarize article {article_id}: {e}")
+                await asyncio.to_thread(
+                    _store_failure,
+                    article_id,
+                    "summarize",
+                    f"Summarization failed: {str(e)[:100]}",
+                    timings,
+                )
+                continue
+            try:
+                await asyncio.to_thread(related.add, article_id)
+            except Exception as e:
+                logging.exception(f"Failed to index article {article_id} as related: {e}")
+
+
+def _recover_interrupted(expired_only: bool = False) -> None:
+    """Return articles left mid-stage by a dead worker to their stage queue.
+
+    With several worker processes only lapsed claim leases are recovered, since
+    the other claims may belong to live processes.
+    """
+    condition = "(lease_expires IS NULL OR lease_expires < :now)" if expired_only else "1"
+    with rx.session() as session:
+        recovered = [
+            article_id
+            for from_status, to_status in (("fetching", "queued"), ("processing", "pending"))
+            for article_id in session.execute(
+                text(
+                    f"UPDATE article SET status = :to_status, lease_owner = NULL, lease_expires = NULL WHERE status = :from_status AND {condition} RETURNING id"
+                ),
+                params={"from_status": from_status, "to_status": to_status, "now": time.time()},
+            ).scalars()
+        ]
+        session.commit()
+    if recovered:
+        logging.warning(f"Recovered {len(recovered)} interrupted articles")
+        article_cache.refresh(*recovered)
+        _wake("fetch")
+        _wake("summarize")
+
+
+def _renew_leases() -> None:
+    """Extend the claim leases of the articles this process is still working on."""
+    held = list(_held)
+    if not held:
+        return
+    with rx.session() as session:
+        session.execute(
+            text(
+                "UPDATE article SET lease_expires = :expires WHERE id IN :ids AND lease_owner = :owner"
+            ).bindparams(bindparam("ids", expanding=True)),
+            params={
+                "ids": held,
+                "owner": coordination.PROCESS_ID,
+                "expires": time.time() + ARTICLE_LEASE_SECONDS,
+            },
+        )
+        session.commit()
+
+
+async def _keep_leases() -> None:
+    while True:
+        await asyncio.sleep(ARTICLE_LEASE_SECONDS / 4)
+        try:
+            await asyncio.to_thread(_renew_leases)
+        except Exception as e:
+            logging.exception(f"Failed to renew article claim leases: {e}")
+
+
+async def _reap_expired_leases() -> None:
+    while True:
+        await asyncio.sleep(ARTICLE_LEASE_SECONDS / 4)
+        try:
+            await asyncio.to_thread(_recover_interrupted, True)
+        except Exception as e:
+            logging.exception(f"Failed to recover articles with expired leases: {e}")
+
+
+def _wake_for_changes(article_ids: list[int]) -> None:
+    """Wake the stages whose queues gained articles changed by another process."""
+    with rx.session() as session:
+        statuses = set(
+            session.execute(
+                text("SELECT DISTINCT status FROM article WHERE id IN :ids").bindparams(
+                    bindparam("ids", expanding=True)
+                ),
+                params={"ids": list(article_ids)},
+            ).scalars()
+        )
+    if "queued" in statuses:
+        _wake("fetch")
+    if "pending" in statuses:
+        _wake("summarize")
+
+
+async def run_pipeline() -> None:
+    """Run all ingestion stages until cancelled; registered as an app lifespan task."""
+    global _loop
+    _loop = asyncio.get_running_loop()
+    _wakeups["fetch"] = asyncio.Event()
+    _wakeups["summarize"] = asyncio.Event()
+    ensure_schema()
+    _recover_interrupted(expired_only=coordination.backend().shared)
+    coordination.on_change(_wake_for_changes)
+    politeness.on_release(_wake_fetch)
+    try:
+        warmup_seconds = await asyncio.to_thread(nlp_data.prewarm)
+        logging.info(f"Summarizer prewarmed in {warmup_seconds:.2f}s")
+    except Exception as e:
+        logging.exception(f"Summarizer prewarm failed, first summary will be slow: {e}")
+    extract_queue: asyncio.Queue = asyncio.Queue(maxsize=STAGE_QUEUE_SIZE)
+    clean_queue: asyncio.Queue = asyncio.Queue(maxsize=STAGE_QUEUE_SIZE)
+    metrics.STAGE_QUEUE_DEPTH.set_function(extract_queue.qsize, stage="extract")
+    metrics.STAGE_QUEUE_DEPTH.set_function(clean_queue.qsize, stage="clean")
+    counts = stage_workers()
+    workers = (
+        [_fetch_worker(extract_queue) for _ in range(counts["fetch"])]
+        + [_extract_worker(extract_queue, clean_queue) for _ in range(counts["extract"])]
+        + [_clean_worker(clean_queue) for _ in range(counts["clean"])]
+        + [_summarize_worker() for _ in range(counts["summarize"])]
+        + (
+            [_keep_leases(), _reap_expired_leases()]
+            if coordination.backend().shared
+            else []
+        )
+    )
+    tasks = [asyncio.create_task(worker) for worker in workers]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        summary_workers.shutdown()
@@ -0,0 +1,117 @@
+"""Per-origin politeness shared by feed polls and article fetches.
+
+Requests to one origin (scheme and host) are capped in number, spaced by the
+origin's robots.txt crawl delay, and share one cached robots.txt.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+from app.utils.fetcher import REQUEST_HEADERS, FetchError, fetch_url
+from app.utils.url_validator import is_safe_url
+
+MAX_REQUESTS_PER_HOST = 2
+DEFAULT_CRAWL_DELAY = 1.0
+MAX_CRAWL_DELAY = 60.0
+ROBOTS_TTL_SECONDS = 24 * 3600
+MAX_TRACKED_HOSTS = 10000
+USER_AGENT = REQUEST_HEADERS["User-Agent"]
+
+
+class _Host:
+    """Politeness state for one origin: a few requests at a time, spaced by its crawl delay."""
+
+    def __init__(self):
+        self.slots = asyncio.Semaphore(MAX_REQUESTS_PER_HOST)
+        self.lock = asyncio.Lock()
+        self.users = 0
+        self.next_allowed = 0.0
+        self.crawl_delay = DEFAULT_CRAWL_DELAY
+        self.robots: RobotFileParser | None = None
+        self.robots_checked_at = float("-inf")
+
+
+_hosts: OrderedDict[str, _Host] = OrderedDict()
+_release_callbacks: list[Callable[[], None]] = []
+
+
+def origin(url: str) -> str:
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc.lower()}"
+
+
+def _load_robots(site: str) -> RobotFileParser:
+    parser = RobotFileParser(f"{site}/robots.txt")
+    try:
+        if is_safe_url(parser.url):
+            raise FetchError("Unsafe robots.txt location.")
+        result = fetch_url(parser.url, content_types=("text/plain",))
+        parser.parse((result.body or b"").decode("utf-8", "replace").splitlines())
+    except FetchError:
+        parser.parse([])
+    parser.modified()
+    return parser
+
+
+def _host(site: str) -> _Host:
+    host = _hosts.get(site)
+    if host is None:
+        host = _hosts[site] = _Host()
+        for stale in [key for key, other in _hosts.items() if not other.users]:
+            if len(_hosts) <= MAX_TRACKED_HOSTS:
+                break
+            del _hosts[stale]
+    _hosts.move_to_end(site)
+    return host
+
+
+def available(url: str) -> bool:
+    """Whether a request to the URL's origin could start about now; safe from any thread."""
+    host = _hosts.get(origin(url))
+    if host is None:
+        return True
+    return not host.slots.locked() and host.next_allowed - time.monotonic() <= DEFAULT_CRAWL_DELAY
+
+
+def on_release(callback: Callable[[], None]) -> None:
+    """Call ``callback()`` whenever a request frees a slot on an origin that was full."""
+    if callback not in _release_callbacks:
+        _release_callbacks.append(callback)
+
+
+@asynccontextmanager
+async def polite(url: str):
+    """Hold a request slot for the URL's origin, waiting out its crawl delay first."""
+    site = origin(url)
+    host = _host(site)
+    host.users += 1
+    try:
+        async with host.slots:
+            try:
+                async with host.lock:
+                    if time.monotonic() - host.robots_checked_at > ROBOTS_TTL_SECONDS:
+                        host.robots = await asyncio.to_thread(_load_robots, site)
+                        host.robots_checked_at = time.monotonic()
+                        host.crawl_delay = min(
+                            MAX_CRAWL_DELAY,
+                            max(
+                                DEFAULT_CRAWL_DELAY,
+                                float(host.robots.crawl_delay(USER_AGENT) or 0),
+                            ),
+                        )
+                        host.next_allowed = time.monotonic() + host.crawl_delay
+                    wait = host.next_allowed - time.monotonic()
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                    host.next_allowed = time.monotonic() + host.crawl_delay
+                yield host
+            finally:
+                if host.slots.locked():
+                    for callback in _release_callbacks:
+                        callback()
+    finally:
+        host.users -= 1
@@ -0,0 +1,180 @@
+import cProfile
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Sequence
+from contextlib import contextmanager
+
+PROFILE_DIR = os.environ.get("SUMMARIZER_PROFILE_DIR", ".profiles")
+SAMPLE_INTERVAL_SECONDS = 0.005
+MAX_STORED_PROFILES = 200
+_PROFILE_ID_PATTERN = re.compile("^[A-Za-z0-9_.-]+$")
+
+_enabled = os.environ.get("SUMMARIZER_PROFILE", "").lower() in ("1", "true", "yes")
+_threshold_seconds = float(os.environ.get("SUMMARIZER_PROFILE_THRESHOLD_MS", "1000")) / 1000
+_lock = threading.Lock()
+
+
+def settings() -> dict:
+    """Return the current profiling switch and slow-call threshold."""
+    return {"enabled": _enabled, "threshold_ms": round(_threshold_seconds * 1000, 3)}
+
+
+def configure(enabled: bool | None = None, threshold_ms: float | None = None) -> dict:
+    """Turn profiling on or off and change the threshold at runtime."""
+    global _enabled, _threshold_seconds
+    if enabled is not None:
+        _enabled = bool(enabled)
+    if threshold_ms is not None:
+        _threshold_seconds = max(0.0, float(threshold_ms)) / 1000
+    return settings()
+
+
+class _StackSampler(threading.Thread):
+    """Periodically sample one thread's stack into collapsed-stack counts."""
+
+    def __init__(self, target_thread_id: int):
+        super().__init__(daemon=True, name="profile-sampler")
+        self.target_thread_id = target_thread_id
+        self.counts: Counter[str] = Counter()
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopped.wait(SAMPLE_INTERVAL_SECONDS):
+            frame = sys._current_frames().get(self.target_thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(
+                    f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                )
+                frame = frame.f_back
+            if stack:
+                self.counts[";".join(reversed(stack))] += 1
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.join()
+
+
+def _prune() -> None:
+    metadata_files = sorted(
+        (entry for entry in os.scandir(PROFILE_DIR) if entry.name.endswith(".json")),
+        key=lambda entry: entry.stat().st_mtime,
+    )
+    for entry in metadata_files[:-MAX_STORED_PROFILES]:
+        profile_id = entry.name[: -len(".json")]
+        for suffix in (".json", ".pstats", ".collapsed"):
+            try:
+                os.remove(os.path.join(PROFILE_DIR, profile_id + suffix))
+            except FileNotFoundError:
+                pass
+
+
+def _article_ids(article_id: int | Sequence[int] | None) -> list[int]:
+    if article_id is None:
+        return []
+    if isinstance(article_id, int):
+        return [article_id]
+    return list(article_id)
+
+
+def _save(
+    section: str,
+    article_ids: list[int],
+    elapsed: float,
+    profile: cProfile.Profile,
+    stack_counts: Counter,
+) -> None:
+    profile_id = f"{section}-{article_ids[0] if article_ids else 'none'}-{time.time_ns()}"
+    with _lock:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        profile.dump_stats(os.path.join(PROFILE_DIR, f"{profile_id}.pstats"))
+        with open(os.path.join(PROFILE_DIR, f"{profile_id}.collapsed"), "w") as f:
+            for stack, count in stack_counts.most_common():
+                f.write(f"{stack} {count}\n")
+        with open(os.path.join(PROFILE_DIR, f"{profile_id}.json"), "w") as f:
+            json.dump(
+                {
+                    "id": profile_id,
+                    "section": section,
+                    "article_id": article_ids[0] if article_ids else None,
+                    "article_ids": article_ids,
+                    "elapsed_ms": round(elapsed * 1000, 3),
+                    "samples": sum(stack_counts.values()),
+                    "captured_at": time.time(),
+                },
+                f,
+            )
+        _prune()
+
+
+@contextmanager
+def profiled(section: str, article_id: int | Sequence[int] | None = None):
+    """Profile the enclosed block and keep the result if it exceeds the threshold.
+
+    A batch passes all of its article ids so the profile is listed under each.
+    """
+    if not _enabled:
+        yield
+        return
+    profile = cProfile.Profile()
+    sampler = _StackSampler(threading.get_ident())
+    try:
+        profile.enable()
+    except ValueError:
+        yield
+        return
+    sampler.start()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.disable()
+        sampler.stop()
+        elapsed = time.perf_counter() - started
+        if elapsed >= _threshold_seconds:
+            try:
+                _save(section, _article_ids(article_id), elapsed, profile, sampler.counts)
+            except OSError as e:
+                logging.exception(f"Failed to store profile for {section}: {e}")
+
+
+def run_profiled(section: str, article_id: int | Sequence[int] | None, func, *args):
+    """Call ``func(*args)`` under ``profiled``; meant for ``asyncio.to_thread``."""
+    with profiled(section, article_id):
+        return func(*args)
+
+
+def list_profiles(article_id: int | None = None) -> list[dict]:
+    """Return stored profile metadata, newest first."""
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    profiles = []
+    for entry in os.scandir(PROFILE_DIR):
+        if not entry.name.endswith(".json"):
+            continue
+        try:
+            with open(entry.path) as f:
+                metadata = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if article_id is None or article_id in metadata.get(
+            "article_ids", [metadata.get("article_id")]
+        ):
+            profiles.append(metadata)
+    profiles.sort(key=lambda metadata: metadata["captured_at"], reverse=True)
+    return profiles
+
+
+def profile_path(profile_id: str, kind: str) -> str | None:
+    """Resolve a stored ``pstats`` or ``collapsed`` file, rejecting unsafe ids."""
+    if kind not in ("pstats", "collapsed") or not _PROFILE_ID_PATTERN.match(profile_id):
+        return None
+    path = os.path.join(PROFILE_DIR, f"{profile_id}.{kind}")
+    return path if os.path.isfile(path) else None
@@ -0,0 +1,320 @@
+"""Related articles from a hashed TF-IDF matrix over titles and summaries.
+
+Feature vectors are persisted per article and kept in memory as one CSR matrix
+(rebuilt in batches) plus a short list of rows added or re-indexed since the
+last rebuild; matrix rows they replace are masked out until then. Cached results
+are brought up to date by scoring only the articles changed since they were cached.
+"""
+
+import logging
+import re
+import threading
+import zlib
+from collections import OrderedDict
+import reflex as rx
+from sqlalchemy import bindparam, text
+from app.utils import coordination
+
+N_FEATURES = 1 << 18
+TOP_K = 5
+MIN_SIMILARITY = 0.1
+REBUILD_AFTER_PENDING = 512
+MAX_CACHED_RESULTS = 4096
+MAX_TRACKED_CHANGES = 4096
+_TOKEN = re.compile("[a-z][a-z0-9']{2,}")
+
+_lock = threading.RLock()
+_rows: dict[int, tuple] = {}
+_doc_freq = None
+_matrix = None
+_matrix_ids: list[int] = []
+_matrix_positions: dict[int, int] = {}
+_outdated: set[int] = set()
+_pending_ids: list[int] = []
+_seq = 0
+_changes: OrderedDict[int, int] = OrderedDict()
+_changes_floor = 0
+_loaded = False
+_results: OrderedDict[int, tuple[int, int, list[tuple[int, float]]]] = OrderedDict()
+
+
+def _vectorize(text_value: str) -> tuple:
+    import numpy
+
+    tokens = _TOKEN.findall(text_value.lower())
+    hashes = numpy.fromiter(
+        (zlib.crc32(token.encode("utf-8")) & (N_FEATURES - 1) for token in tokens),
+        dtype=numpy.uint32,
+        count=len(tokens),
+    )
+    indices, counts = numpy.unique(hashes, return_counts=True)
+    return indices.astype(numpy.uint32), counts.astype(numpy.float32)
+
+
+def _weighted(article_ids: list[int]):
+    """Build L2-normalized, sublinear TF-IDF rows for the given articles."""
+    import numpy
+    from scipy.sparse import csr_matrix
+
+    rows = [_rows[article_id] for article_id in article_ids]
+    indptr = numpy.zeros(len(rows) + 1, dtype=numpy.int64)
+    indptr[1:] = numpy.cumsum([len(row[0]) for row in rows])
+    if rows:
+        indices = numpy.concatenate([row[0] for row in rows])
+        counts = numpy.concatenate([row[1] for row in rows])
+    else:
+        indices = numpy.zeros(0, dtype=numpy.uint32)
+        counts = numpy.zeros(0, dtype=numpy.float32)
+    idf = numpy.log((1.0 + len(_rows)) / (1.0 + _doc_freq[indices])) + 1.0
+    data = (1.0 + numpy.log(counts)) * idf
+    matrix = csr_matrix((data, indices, indptr), shape=(len(rows), N_FEATURES))
+    norms = numpy.sqrt(numpy.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return csr_matrix(matrix.multiply(1.0 / norms[:, None]))
+
+
+def _rebuild() -> None:
+    global _matrix, _matrix_ids, _matrix_positions, _pending_ids
+    _matrix_ids = list(_rows)
+    _matrix = _weighted(_matrix_ids)
+    _matrix_positions = {
+        article_id: position for position, article_id in enumerate(_matrix_ids)
+    }
+    _outdated.clear()
+    _pending_ids = []
+
+
+def _changed(article_id: int) -> None:
+    """Record that an article's row changed, for updating other articles' cached results."""
+    global _seq, _changes_floor
+    _seq += 1
+    _changes[article_id] = _seq
+    _changes.move_to_end(article_id)
+    _results.pop(article_id, None)
+    while len(_changes) > MAX_TRACKED_CHANGES:
+        _changes_floor = _changes.popitem(last=False)[1]
+
+
+def _put_row(article_id: int, row: tuple) -> None:
+    old = _rows.get(article_id)
+    if old is not None:
+        _doc_freq[old[0]] -= 1
+    _rows[article_id] = row
+    _doc_freq[row[0]] += 1
+    if article_id in _matrix_positions and article_id not in _outdated:
+        _outdated.add(article_id)
+        _pending_ids.append(article_id)
+    elif old is None:
+        _pending_ids.append(article_id)
+    _changed(article_id)
+
+
+def _pack(row: tuple) -> tuple[bytes, bytes]:
+    return row[0].tobytes(), row[1].tobytes()
+
+
+def ensure_loaded() -> None:
+    """Load stored vectors and vectorize completed articles that have none yet."""
+    global _doc_freq, _loaded
+    if _loaded:
+        return
+    import numpy
+
+    with _lock:
+        if _loaded:
+            return
+        _doc_freq = numpy.zeros(N_FEATURES, dtype=numpy.int32)
+        _rows.clear()
+        _pending_ids.clear()
+        with rx.session() as session:
+            stored = session.execute(
+                text("SELECT article_id, indices, counts FROM tfidf_vector")
+            ).all()
+            missing = session.execute(
+                text(
+                    "SELECT id, title, summary FROM article WHERE status = 'completed' AND summary IS NOT NULL AND duplicate_of IS NULL AND id NOT IN (SELECT article_id FROM tfidf_vector)"
+                )
+            ).all()
+        for article_id, indices, counts in stored:
+            _put_row(
+                article_id,
+                (
+                    numpy.frombuffer(bytes(indices), dtype=numpy.uint32),
+                    numpy.frombuffer(bytes(counts), dtype=numpy.float32),
+                ),
+            )
+        for article_id, title, summary in missing:
+            row = _vectorize(f"{title} {summary}")
+            _store(article_id, row)
+            _put_row(article_id, row)
+        _rebuild()
+        _loaded = True
+
+
+def _store(article_id: int, row: tuple) -> None:
+    indices, counts = _pack(row)
+    with rx.session() as session:
+        session.execute(
+            text(
+                "INSERT OR REPLACE INTO tfidf_vector (article_id, indices, counts) VALUES (:id, :indices, :counts)"
+            ),
+            params={"id": article_id, "indices": indices, "counts": counts},
+        )
+        session.commit()
+    coordination.publish(article_id)
+
+
+def add(article_id: int) -> None:
+    """Index (or re-index) a completed article from its title and summary.
+
+    The vector is always stored; the in-memory index only changes once loaded,
+    since loading reads every stored vector anyway.
+    """
+    with rx.session() as session:
+        row = session.execute(
+            text(
+                "SELECT title, summary FROM article WHERE id = :id AND summary IS NOT NULL AND duplicate_of IS NULL"
+            ),
+            params={"id": article_id},
+        ).first()
+    if row is None:
+        return
+    vector = _vectorize(f"{row[0]} {row[1]}")
+    _store(article_id, vector)
+    with _lock:
+        if _loaded:
+            _put_row(article_id, vector)
+
+
+def _drop_row(article_id: int) -> None:
+    old = _rows.pop(article_id, None)
+    if old is None or _doc_freq is None:
+        _results.pop(article_id, None)
+        return
+    _doc_freq[old[0]] -= 1
+    if article_id in _matrix_positions:
+        _outdated.add(article_id)
+    if article_id in _pending_ids:
+        _pending_ids.remove(article_id)
+    _changed(article_id)
+
+
+def forget(article_id: int) -> None:
+    with rx.session() as session:
+        session.execute(
+            text("DELETE FROM tfidf_vector WHERE article_id = :id"),
+            params={"id": article_id},
+        )
+        session.commit()
+    with _lock:
+        _drop_row(article_id)
+    coordination.publish(article_id)
+
+
+def sync(article_ids: list[int]) -> None:
+    """Reload vectors another process stored or deleted for these articles."""
+    if not _loaded:
+        return
+    import numpy
+
+    with rx.session() as session:
+        stored = session.execute(
+            text(
+                "SELECT article_id, indices, counts FROM tfidf_vector WHERE article_id IN :ids"
+            ).bindparams(bindparam("ids", expanding=True)),
+            params={"ids": list(article_ids)},
+        ).all()
+    found = {row[0]: row for row in stored}
+    with _lock:
+        for article_id in article_ids:
+            if article_id not in found:
+                _drop_row(article_id)
+                continue
+            _, indices, counts = found[article_id]
+            row = (
+                numpy.frombuffer(bytes(indices), dtype=numpy.uint32),
+                numpy.frombuffer(bytes(counts), dtype=numpy.float32),
+            )
+            old = _rows.get(article_id)
+            if old is None or not (
+                numpy.array_equal(old[0], row[0]) and numpy.array_equal(old[1], row[1])
+            ):
+                _put_row(article_id, row)
+
+
+def _similar(article_id: int, k: int) -> list[tuple[int, float]]:
+    import numpy
+
+    if len(_pending_ids) + len(_outdated) >= REBUILD_AFTER_PENDING:
+        _rebuild()
+    query = _weighted([article_id])
+    scores = (_matrix @ query.T).toarray().ravel()
+    if _outdated:
+        scores[[_matrix_positions[outdated] for outdated in _outdated]] = 0.0
+    ids = _matrix_ids
+    if _pending_ids:
+        pending_scores = (_weighted(_pending_ids) @ query.T).toarray().ravel()
+        scores = numpy.concatenate([scores, pending_scores])
+        ids = _matrix_ids + _pending_ids
+    if len(scores) == 0:
+        return []
+    top = numpy.argpartition(-scores, min(k + 1, len(scores) - 1))[: k + 1]
+    ranked = sorted(top, key=lambda position: -scores[position])
+    return [
+        (ids[position], round(float(scores[position]), 4))
+        for position in ranked
+        if ids[position] != article_id and scores[position] >= MIN_SIMILARITY
+    ][:k]
+
+
+def _refreshed(article_id: int, cached: tuple) -> list[tuple[int, float]] | None:
+    """Update cached results with articles changed since, or ``None`` to recompute."""
+    seq, k, results = cached
+    if seq == _seq:
+        return results
+    if seq < _changes_floor:
+        return None
+    changed = []
+    for changed_id, changed_seq in reversed(_changes.items()):
+        if changed_seq <= seq:
+            break
+        changed.append(changed_id)
+    if set(changed) & {result_id for result_id, _ in results}:
+        return None
+    candidates = [changed_id for changed_id in changed if changed_id in _rows]
+    if not candidates:
+        return results
+    scores = (_weighted(candidates) @ _weighted([article_id]).T).toarray().ravel()
+    merged = results + [
+        (candidate, round(float(score), 4))
+        for candidate, score in zip(candidates, scores)
+        if score >= MIN_SIMILARITY
+    ]
+    return sorted(merged, key=lambda result: -result[1])[:k]
+
+
+def related(article_id: int, k: int = TOP_K) -> list[tuple[int, float]]:
+    """Return up to ``k`` ``(article_id, cosine similarity)`` pairs, best first."""
+    try:
+        ensure_loaded()
+    except Exception as e:
+        logging.exception(f"Failed to load the related-articles index: {e}")
+        return []
+    with _lock:
+        if article_id not in _rows:
+            return []
+        cached = _results.get(article_id)
+        if cached is not None and cached[1] >= k:
+            results = _refreshed(article_id, cached)
+            if results is not None:
+                _results[article_id] = (_seq, cached[1], results)
+                _results.move_to_end(article_id)
+                return results[:k]
+        results = _similar(article_id, k)
+        _results[article_id] = (_seq, k, results)
+        while len(_results) > MAX_CACHED_RESULTS:
+            _results.popitem(last=False)
+        return results
+
+
+coordination.on_change(sync)
@@ -1,42 +1,299 @@
-import nltk
-from sumy.parsers.plaintext import PlaintextParser
-from sumy.nlp.tokenizers import Tokenizer
-from sumy.summarizers.lsa import LsaSummarizer
 import logging
+from app.utils import metrics, nlp_data, summary_cache, summary_workers
+from app.utils.document import TokenizedDocument
 from app.utils.text_cleaner import clean_text
 import re
+import time
 
-try:
-    nltk.data.find("tokenizers/punkt")
-except nltk.downloader.DownloadError as e:
-    logging.exception(f"Error finding punkt tokenizer, attempting download: {e}")
-    nltk.download("punkt", quiet=True)
+BATCH_MAX_WORDS = 1500
+BATCH_MAX_SENTENCES = 80
+LSA_SMOOTHING = 0.4
+
+
+def default_sentence_count(
+    doc_sentence_count: int, min_sentences: int = 2, max_sentences: int = 5
+) -> int:
+    return max(min_sentences, min(max_sentences, doc_sentence_count // 3))
+
+
+def _sumy_document(cleaned_text: str, tokenized: TokenizedDocument | None):
+    from sumy.models.dom import ObjectDocumentModel, Paragraph, Sentence
+    from sumy.parsers.plaintext import PlaintextParser
+
+    tokenizer = nlp_data.tokenizer()
+    if tokenized is None:
+        return PlaintextParser.from_string(cleaned_text, tokenizer).document
+    return ObjectDocumentModel(
+        [Paragraph([Sentence(sentence, tokenizer) for sentence in tokenized.sentences()])]
+    )
+
+
+def _lsa_scores(document) -> list[float]:
+    import numpy
+    from sumy.summarizers.lsa import LsaSummarizer
+
+    summarizer = LsaSummarizer()
+    dictionary = summarizer._create_dictionary(document)
+    if not dictionary:
+        raise ValueError("Document has no words to rank.")
+    matrix = summarizer._compute_term_frequency(
+        summarizer._create_matrix(document, dictionary)
+    )
+    _, sigma, v = numpy.linalg.svd(matrix, full_matrices=False)
+    return [float(score) for score in summarizer._compute_ranks(sigma, v)]
+
+
+def lsa_scores(tokenized: TokenizedDocument) -> list[float]:
+    """Score a tokenized document's sentences without touching the caches."""
+    return _lsa_scores(_sumy_document(tokenized.text, tokenized))
+
+
+def warm_up(tokenized: TokenizedDocument) -> None:
+    """Score one document so every lazily loaded dependency is in memory."""
+    lsa_scores(tokenized)
+
+
+def _scores_from_ranking(ranking) -> list[float]:
+    scores = [0.0] * len(ranking)
+    for position, index in enumerate(ranking):
+        scores[index] = float(len(ranking) - position)
+    return scores
+
+
+def _lsa_ranked_sentences(
+    cleaned_text: str, tokenized: TokenizedDocument | None = None
+) -> tuple[list[str], list[float]]:
+    """Split text into sentences and rate them with sumy's LSA, reusing cached ratings."""
+    digest = summary_cache.content_hash(cleaned_text)
+    scores = summary_cache.get_scores(digest, "lsa")
+    if tokenized is not None:
+        sentences = tokenized.sentences()
+        if scores is not None and len(scores) == len(sentences):
+            return sentences, scores
+        if summary_workers.enabled():
+            scores = _scores_from_ranking(summary_workers.rank(tokenized))
+        else:
+            scores = _lsa_scores(_sumy_document(cleaned_text, tokenized))
+    else:
+        document = _sumy_document(cleaned_text, None)
+        sentences = [str(sentence) for sentence in document.sentences]
+        if scores is not None and len(scores) == len(sentences):
+            return sentences, scores
+        scores = _lsa_scores(document)
+    try:
+        summary_cache.put_scores(digest, "lsa", scores)
+    except Exception as e:
+        logging.exception(f"Failed to store sentence scores in cache: {e}")
+    return sentences, scores
+
+
+def _top_sentences(sentences: list[str], scores: list[float], count: int) -> str:
+    best = sorted(range(len(sentences)), key=scores.__getitem__, reverse=True)[:count]
+    return " ".join(sentences[index] for index in sorted(best))
+
+
+def _prepare(
+    text: str, tokenized: TokenizedDocument | None
+) -> tuple[str, TokenizedDocument | None]:
+    if tokenized is not None and tokenized.text == text:
+        return text, tokenized
+    return clean_text(text), None
+
+
+def _summary_key(
+    cleaned_text: str, min_sentences: int, max_sentences: int, sentences_count: int | None
+) -> str:
+    if sentences_count is None:
+        return summary_cache.cache_key(cleaned_text, "lsa", min_sentences, max_sentences)
+    return summary_cache.cache_key(cleaned_text, "lsa", sentences_count, sentences_count)
+
+
+def _cached_summary(key: str) -> str | None:
+    try:
+        return summary_cache.get(key)
+    except Exception as e:
+        logging.exception(f"Summary cache lookup failed: {e}")
+        return None
+
+
+def _compose(
+    sentences: list[str],
+    scores: list[float],
+    min_sentences: int,
+    max_sentences: int,
+    sentences_count: int | None,
+) -> str:
+    count = sentences_count or default_sentence_count(
+        len(sentences), min_sentences, max_sentences
+    )
+    cleaned_summary = clean_text(_top_sentences(sentences, scores, count))
+    if not cleaned_summary or (
+        sentences_count is None and len(cleaned_summary.split()) < 10
+    ):
+        raise ValueError("Generated summary is too short or invalid.")
+    return cleaned_summary
+
+
+def _fallback(
+    cleaned_text: str, tokenized: TokenizedDocument | None, sentences_count: int | None
+) -> str:
+    if tokenized is not None:
+        sentences = tokenized.sentences()
+    else:
+        sentences = re.split("(?<=[.!?])\\s+", cleaned_text)
+    fallback_summary = " ".join(sentences[: sentences_count or 3])
+    return fallback_summary if fallback_summary else cleaned_text[:500]
+
+
+def _remember(key: str, cleaned_summary: str) -> None:
+    try:
+        summary_cache.put(key, cleaned_summary)
+    except Exception as e:
+        logging.exception(f"Failed to store summary in cache: {e}")
 
 
 def summarize_text_lsa(
-    text: str | None, min_sentences: int = 2, max_sentences: int = 5
+    text: str | None,
+    min_sentences: int = 2,
+    max_sentences: int = 5,
+    sentences_count: int | None = None,
+    tokenized: TokenizedDocument | None = None,
 ) -> str | None:
-    """Summarize text using LSA algorithm from sumy after cleaning it."""
+    """Summarize text using LSA algorithm from sumy after cleaning it.
+
+    ``sentences_count`` overrides the derived length and ``tokenized`` reuses the
+    sentence split stored at ingest.
+    """
     if not text:
         return None
-    cleaned_text = clean_text(text)
+    cleaned_text, tokenized = _prepare(text, tokenized)
     if not cleaned_text:
         return None
+    key = _summary_key(cleaned_text, min_sentences, max_sentences, sentences_count)
+    cached_summary = _cached_summary(key)
+    if cached_summary is not None:
+        return cached_summary
+    started = time.perf_counter()
     try:
-        parser = PlaintextParser.from_string(cleaned_text, Tokenizer("english"))
-        summarizer = LsaSummarizer()
-        doc_sentence_count = len(parser.document.sentences)
-        sentences_count = max(
-            min_sentences, min(max_sentences, doc_sentence_count // 3)
+        sentences, scores = _lsa_ranked_sentences(cleaned_text, tokenized)
+        cleaned_summary = _compose(
+            sentences, scores, min_sentences, max_sentences, sentences_count
+        )
+        metrics.SUMMARIZE_SECONDS.observe(
+            time.perf_counter() - started, algorithm="lsa"
         )
-        summary_sentences = summarizer(parser.document, sentences_count)
-        summary = " ".join([str(sentence) for sentence in summary_sentences])
-        cleaned_summary = clean_text(summary)
-        if not cleaned_summary or len(cleaned_summary.split()) < 10:
-            raise ValueError("Generated summary is too short or invalid.")
-        return cleaned_summary
     except Exception as e:
-        logging.exception(f"Error during LSA summarization, falling back: {e}")
-        sentences = re.split("(?<=[.!?])\\s+", cleaned_text)
-        fallback_summary = " ".join(sentences[:3])
-        return fallback_summary if fallback_summary else cleaned_text[:500]
\ No newline at end of file
+        if isinstance(e, LookupError):
+            nlp_data.report_fallback(e)
+        else:
+            logging.exception(f"Error during LSA summarization, falling back: {e}")
+        fallback_summary = _fallback(cleaned_text, tokenized, sentences_count)
+        metrics.SUMMARIZE_SECONDS.observe(
+            time.perf_counter() - started, algorithm="fallback"
+        )
+        return fallback_summary
+    _remember(key, cleaned_summary)
+    return cleaned_summary
+
+
+def _batch_lsa_scores(documents: list[TokenizedDocument]) -> list[list[float]]:
+    """Rate the sentences of several short documents with one batched SVD.
+
+    Matches sumy's LsaSummarizer (no stemmer or stop words): each document's
+    term-by-sentence counts are smoothed by the sentence's most frequent term and
+    zero-padded into one stack, which leaves the non-zero singular values unchanged.
+    """
+    import numpy
+
+    tokenizer = nlp_data.tokenizer()
+    layouts = []
+    for tokenized in documents:
+        vocabulary: dict[str, int] = {}
+        rows, columns = [], []
+        for column, sentence in enumerate(tokenized.sentences()):
+            for word in tokenizer.to_words(sentence):
+                rows.append(vocabulary.setdefault(word.lower(), len(vocabulary)))
+                columns.append(column)
+        if not rows:
+            raise ValueError("Document has no words to rank.")
+        layouts.append((numpy.array(rows), numpy.array(columns), tokenized.sentence_count))
+    max_rows = max(int(rows.max()) + 1 for rows, _, _ in layouts)
+    max_columns = max(sentence_count for _, _, sentence_count in layouts)
+    counts = numpy.zeros((len(layouts), max_rows, max_columns))
+    mask = numpy.zeros_like(counts, dtype=bool)
+    for index, (rows, columns, sentence_count) in enumerate(layouts):
+        numpy.add.at(counts[index], (rows, columns), 1.0)
+        mask[index, : int(rows.max()) + 1, :sentence_count] = True
+    column_max = counts.max(axis=1, keepdims=True)
+    smoothed = LSA_SMOOTHING + (1.0 - LSA_SMOOTHING) * numpy.divide(
+        counts, column_max, out=numpy.zeros_like(counts), where=column_max > 0
+    )
+    matrix = numpy.where(mask & (column_max > 0), smoothed, counts)
+    _, sigma, v = numpy.linalg.svd(matrix, full_matrices=False)
+    ranks = numpy.sqrt(numpy.einsum("bk,bkn->bn", sigma**2, v**2))
+    return [
+        ranks[index, :sentence_count].tolist()
+        for index, (_, _, sentence_count) in enumerate(layouts)
+    ]
+
+
+def summarize_batch(
+    items: list[tuple[str, TokenizedDocument | None, int | None]],
+    min_sentences: int = 2,
+    max_sentences: int = 5,
+) -> list[str | None]:
+    """Summarize many ``(text, tokenized, sentences_count)`` items, batching short ones."""
+    results: list[str | None] = [None] * len(items)
+    batch = []
+    for index, (text, tokenized, sentences_count) in enumerate(items):
+        if (
+            not text
+            or tokenized is None
+            or tokenized.text != text
+            or summary_workers.enabled()
+            or not 0 < tokenized.sentence_count <= BATCH_MAX_SENTENCES
+            or tokenized.word_count > BATCH_MAX_WORDS
+        ):
+            results[index] = summarize_text_lsa(
+                text, min_sentences, max_sentences, sentences_count, tokenized
+            )
+            continue
+        key = _summary_key(text, min_sentences, max_sentences, sentences_count)
+        results[index] = _cached_summary(key)
+        if results[index] is None:
+            batch.append((index, key))
+    if not batch:
+        return results
+    started = time.perf_counter()
+    documents = [items[index][1] for index, _ in batch]
+    try:
+        all_scores = _batch_lsa_scores(documents)
+    except Exception as e:
+        if not isinstance(e, LookupError):
+            logging.exception(f"Batched LSA failed, summarizing one by one: {e}")
+        for index, _ in batch:
+            text, tokenized, sentences_count = items[index]
+            results[index] = summarize_text_lsa(
+                text, min_sentences, max_sentences, sentences_count, tokenized
+            )
+        return results
+    metrics.SUMMARIZE_SECONDS.observe(
+        (time.perf_counter() - started) / len(batch), algorithm="lsa_batch"
+    )
+    for (index, key), tokenized, scores in zip(batch, documents, all_scores):
+        sentences_count = items[index][2]
+        try:
+            summary_cache.put_scores(
+                summary_cache.content_hash(tokenized.text), "lsa", scores
+            )
+        except Exception as e:
+            logging.exception(f"Failed to store sentence scores in cache: {e}")
+        try:
+            results[index] = _compose(
+                tokenized.sentences(), scores, min_sentences, max_sentences, sentences_count
+            )
+        except ValueError:
+            results[index] = _fallback(tokenized.text, tokenized, sentences_count)
+            continue
+        _remember(key, results[index])
+    return results
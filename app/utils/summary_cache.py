@@ -0,0 +1,96 @@
+import hashlib
+from array import array
+import threading
+import time
+from collections import OrderedDict
+import reflex as rx
+from sqlalchemy import text
+from app.utils import metrics
+
+MAX_MEMORY_ENTRIES = 1024
+
+_memory: OrderedDict[str, str] = OrderedDict()
+_lock = threading.Lock()
+
+
+def content_hash(cleaned_text: str) -> str:
+    return hashlib.sha256(cleaned_text.encode("utf-8")).hexdigest()
+
+
+def cache_key(
+    cleaned_text: str, algorithm: str, min_sentences: int, max_sentences: int
+) -> str:
+    """Key a summary by its input text and every parameter that affects the output."""
+    return f"{content_hash(cleaned_text)}:{algorithm}:{min_sentences}:{max_sentences}"
+
+
+def _remember(key: str, summary: str) -> None:
+    with _lock:
+        _memory[key] = summary
+        _memory.move_to_end(key)
+        while len(_memory) > MAX_MEMORY_ENTRIES:
+            _memory.popitem(last=False)
+
+
+def get(key: str) -> str | None:
+    """Look a summary up in memory, then on disk, promoting disk hits into memory."""
+    with _lock:
+        summary = _memory.get(key)
+        if summary is not None:
+            _memory.move_to_end(key)
+    if summary is not None:
+        metrics.SUMMARY_CACHE_RESULTS.inc(result="memory")
+        return summary
+    with rx.session() as session:
+        summary = session.execute(
+            text("SELECT summary FROM summary_cache WHERE cache_key = :key"),
+            params={"key": key},
+        ).scalar_one_or_none()
+    if summary is None:
+        metrics.SUMMARY_CACHE_RESULTS.inc(result="miss")
+        return None
+    metrics.SUMMARY_CACHE_RESULTS.inc(result="disk")
+    _remember(key, summary)
+    return summary
+
+
+def put(key: str, summary: str) -> None:
+    _remember(key, summary)
+    with rx.session() as session:
+        session.execute(
+            text(
+                "INSERT OR REPLACE INTO summary_cache (cache_key, summary, created_at) VALUES (:key, :summary, :now)"
+            ),
+            params={"key": key, "summary": summary, "now": time.time()},
+        )
+        session.commit()
+
+
+def get_scores(digest: str, algorithm: str) -> list[float] | None:
+    """Return per-sentence ratings stored by an earlier pass over the same text."""
+    with rx.session() as session:
+        blob = session.execute(
+            text(
+                "SELECT scores FROM sentence_scores WHERE content_hash = :digest AND algorithm = :algorithm"
+            ),
+            params={"digest": digest, "algorithm": algorithm},
+        ).scalar_one_or_none()
+    if blob is None:
+        return None
+    return array("d", bytes(blob)).tolist()
+
+
+def put_scores(digest: str, algorithm: str, scores: list[float]) -> None:
+    with rx.session() as session:
+        session.execute(
+            text(
+                "INSERT OR REPLACE INTO sentence_scores (content_hash, algorithm, scores, created_at) VALUES (:digest, :algorithm, :scores, :now)"
+            ),
+            params={
+                "digest": digest,
+                "algorithm": algorithm,
+                "scores": array("d", scores).tobytes(),
+                "now": time.time(),
+            },
+        )
+        session.commit()
@@ -0,0 +1,100 @@
+"""Score sentences in worker processes, passing documents through shared memory.
+
+Each job message carries only a segment name and two byte lengths; the worker
+reads the UTF-8 text and packed sentence offsets from the segment and replies
+with the sentence indices in rank order as a packed uint32 array.
+"""
+
+import codecs
+import logging
+import multiprocessing
+import os
+import threading
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.shared_memory import SharedMemory
+from app.utils.document import TokenizedDocument
+
+PROCESSES = int(os.environ.get("SUMMARIZER_PROCESSES", "0"))
+SCORE_TIMEOUT_SECONDS = 120
+
+_executor: ProcessPoolExecutor | None = None
+_lock = threading.Lock()
+
+
+def enabled() -> bool:
+    return PROCESSES > 0
+
+
+def _init_worker() -> None:
+    from app.utils import nlp_data
+
+    try:
+        nlp_data.prewarm()
+    except Exception as e:
+        logging.exception(f"Summarizer worker prewarm failed: {e}")
+
+
+def _rank_shared(name: str, text_bytes: int, offset_bytes: int) -> bytes:
+    """Worker side: rank the sentences of the document stored in segment ``name``."""
+    from app.utils import summarizer
+
+    segment = SharedMemory(name=name)
+    try:
+        with segment.buf[:text_bytes] as view:
+            text = codecs.decode(view, "utf-8")
+        offsets = array("I")
+        with segment.buf[text_bytes : text_bytes + offset_bytes] as view:
+            offsets.frombytes(view)
+    finally:
+        segment.close()
+    tokenized = TokenizedDocument(text, offsets, 0)
+    scores = summarizer.lsa_scores(tokenized)
+    ranking = sorted(range(len(scores)), key=scores.__getitem__, reverse=True)
+    return array("I", ranking).tobytes()
+
+
+def _pool() -> ProcessPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=PROCESSES,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+        return _executor
+
+
+def rank(tokenized: TokenizedDocument) -> array:
+    """Return sentence indices best-first, computed in a worker process."""
+    global _executor
+    encoded = tokenized.text.encode("utf-8")
+    text_bytes = len(encoded)
+    offsets = memoryview(tokenized.offsets).cast("B")
+    segment = SharedMemory(create=True, size=max(1, text_bytes + len(offsets)))
+    try:
+        segment.buf[:text_bytes] = encoded
+        segment.buf[text_bytes : text_bytes + len(offsets)] = offsets
+        del encoded
+        future = _pool().submit(_rank_shared, segment.name, text_bytes, len(offsets))
+        ranking_bytes = future.result(timeout=SCORE_TIMEOUT_SECONDS)
+    except BrokenProcessPool:
+        with _lock:
+            _executor = None
+        raise
+    finally:
+        segment.close()
+        segment.unlink()
+    ranking = array("I")
+    ranking.frombytes(ranking_bytes)
+    return ranking
+
+
+def shutdown() -> None:
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -2,14 +2,18 @@ import reflex as rx
 import unicodedata
 import re
 import html
+import time
+from app.utils import metrics
 
 
 def clean_text(text: str | None) -> str:
     """Sanitize text to be clean, English-only ASCII."""
     if not text:
         return ""
+    started = time.perf_counter()
     text = html.unescape(text)
     text = unicodedata.normalize("NFKD", text).encode("ASCII", "ignore").decode("UTF-8")
     text = re.sub("[^A-Za-z0-9\\s.,!?\\-:;\\'\"()&]", " ", text)
     text = re.sub("\\s+", " ", text).strip()
+    metrics.CLEAN_TEXT_SECONDS.observe(time.perf_counter() - started)
     return text
\ No newline at end of file
@@ -4,15 +4,28 @@ from urllib.parse import urlparse
 import logging
 
 
-def is_safe_url(url: str) -> str | None:
-    """Validates a URL to prevent SSRF and other attacks."""
+def validate_url_format(url: str) -> str | None:
+    """Check the URL scheme and hostname without touching the network."""
     try:
         parsed_url = urlparse(url)
         if parsed_url.scheme not in ["http", "https"]:
             return f"Invalid URL scheme: '{parsed_url.scheme}'. Only HTTP/HTTPS is allowed."
-        hostname = parsed_url.hostname
-        if not hostname:
+        if not parsed_url.hostname:
             return "URL must have a valid hostname."
+    except ValueError as e:
+        logging.exception(f"Invalid URL format for {url}: {e}")
+        return "Invalid URL format."
+    return None
+
+
+def is_safe_url(url: str) -> str | None:
+    """Validates a URL to prevent SSRF and other attacks."""
+    format_error = validate_url_format(url)
+    if format_error:
+        return format_error
+    try:
+        parsed_url = urlparse(url)
+        hostname = parsed_url.hostname
         try:
             addr_info = socket.getaddrinfo(hostname, None)
             ip_str = addr_info[0][4][0]
@@ -0,0 +1,44 @@
+"""Run the worker tier (pipeline, feed poller, maintenance) without the web app.
+
+Start any number with ``SUMMARIZER_COORDINATION=sqlite python -m app.utils.worker``
+next to web processes started with ``SUMMARIZER_ROLE=web``.
+"""
+
+import asyncio
+import logging
+import sys
+from app.utils import coordination
+from app.utils.feeds import run_feed_poller
+from app.utils.maintenance import run_maintenance
+from app.utils.pipeline import run_pipeline
+
+WORKER_TASKS = (run_pipeline, run_feed_poller, run_maintenance)
+
+
+async def run_worker() -> None:
+    tasks = [
+        asyncio.create_task(task())
+        for task in (coordination.listen_for_changes, *WORKER_TASKS)
+    ]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO)
+    if not coordination.backend().shared:
+        logging.warning(
+            "SUMMARIZER_COORDINATION is not 'sqlite'; a separate worker process will not coordinate with the web tier"
+        )
+    try:
+        asyncio.run(run_worker())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""Multi-process tests of the shared SQLite coordination backend.
+
+Each test spawns fresh processes against a throwaway database, so the module
+level state of ``app.utils`` is never shared the way it would be in one process.
+"""
+
+import multiprocessing
+import time
+import pytest
+
+PROCESSES = 4
+ATTEMPTS = 50
+RATE_KEY = "test:rate"
+RATE_LIMIT = 25
+LEASE_NAME = "test:lease"
+CHANGES_PER_PROCESS = 20
+TIMEOUT_SECONDS = 60
+
+
+def _call(results, index, func, args) -> None:
+    try:
+        results.put((index, None, func(*args)))
+    except BaseException as e:
+        results.put((index, repr(e), None))
+
+
+def _run(context, calls: list) -> list:
+    """Run ``(func, args)`` calls in parallel spawned processes and return their results."""
+    results = context.Queue()
+    processes = [
+        context.Process(target=_call, args=(results, index, func, args))
+        for index, (func, args) in enumerate(calls)
+    ]
+    for process in processes:
+        process.start()
+    collected = {}
+    try:
+        for _ in processes:
+            index, error, value = results.get(timeout=TIMEOUT_SECONDS * 2)
+            assert error is None, f"process {index} failed: {error}"
+            collected[index] = value
+    finally:
+        for process in processes:
+            process.join(TIMEOUT_SECONDS)
+            if process.is_alive():
+                process.terminate()
+    return [collected[index] for index in range(len(calls))]
+
+
+def _create_schema() -> None:
+    from app.utils.database import ensure_schema
+
+    ensure_schema()
+
+
+def _contend(index: int, barrier) -> dict:
+    from app.utils import coordination
+
+    coordinator = coordination.backend()
+    barrier.wait(TIMEOUT_SECONDS)
+    allowed = sum(
+        coordinator.check_and_record(RATE_KEY, RATE_LIMIT, 3600) for _ in range(ATTEMPTS)
+    )
+    held = []
+    for _ in range(ATTEMPTS // 5):
+        if coordinator.acquire_lease(LEASE_NAME, 30):
+            started = time.time()
+            time.sleep(0.01)
+            held.append((started, time.time()))
+            coordinator.release_lease(LEASE_NAME)
+    own = [index * CHANGES_PER_PROCESS + offset + 1 for offset in range(CHANGES_PER_PROCESS)]
+    coordinator.publish(own)
+    expected = set(range(1, PROCESSES * CHANGES_PER_PROCESS + 1)) - set(own)
+    seen, cursor = set(), 0
+    deadline = time.time() + TIMEOUT_SECONDS
+    while not expected <= seen and time.time() < deadline:
+        cursor, changed = coordinator.changes_since(cursor)
+        seen.update(changed)
+        time.sleep(0.05)
+    return {
+        "allowed": allowed,
+        "held": held,
+        "missing_changes": sorted(expected - seen),
+        "own_echoed": sorted(seen & set(own)),
+    }
+
+
+def _insert_completed(title: str, summary: str) -> int:
+    import reflex as rx
+    from sqlalchemy import text
+
+    with rx.session() as session:
+        article_id = session.execute(
+            text(
+                "INSERT INTO article (url, title, status, summary) VALUES (:url, :title, 'completed', :summary) RETURNING id"
+            ),
+            params={"url": f"https://example.com/{title}", "title": title, "summary": summary},
+        ).scalar_one()
+        session.commit()
+    return article_id
+
+
+def _web_side(article_id: int, ready) -> tuple[list, list]:
+    """Load the related index, then wait for another process to add a similar article."""
+    import asyncio
+    from app.utils import coordination, related
+
+    before = [related_id for related_id, _ in related.related(article_id)]
+
+    async def wait_for_related() -> list:
+        listener = asyncio.create_task(coordination.listen_for_changes())
+        try:
+            await asyncio.sleep(coordination.CHANGE_POLL_SECONDS * 4)
+            ready.set()
+            deadline = time.time() + TIMEOUT_SECONDS
+            while time.time() < deadline:
+                found = await asyncio.to_thread(related.related, article_id)
+                if found:
+                    return [related_id for related_id, _ in found]
+                await asyncio.sleep(0.1)
+            return []
+        finally:
+            listener.cancel()
+
+    return before, asyncio.run(wait_for_related())
+
+
+def _worker_side(ready) -> int:
+    """Finish an article the way the summarize stage does, without loading the index."""
+    from app.utils import related
+
+    assert ready.wait(TIMEOUT_SECONDS)
+    article_id = _insert_completed(
+        "grid-storage", "Battery storage keeps the solar power grid stable at night."
+    )
+    related.add(article_id)
+    return article_id
+
+
+@pytest.fixture
+def context(tmp_path, monkeypatch):
+    monkeypatch.setenv("REFLEX_DB_URL", f"sqlite:///{tmp_path / 'coordination.db'}")
+    monkeypatch.setenv("SUMMARIZER_COORDINATION", "sqlite")
+    monkeypatch.setenv("SUMMARIZER_ROLE", "all")
+    context = multiprocessing.get_context("spawn")
+    _run(context, [(_create_schema, ())])
+    return context
+
+
+def test_processes_share_rate_limits_leases_and_changes(context):
+    barrier = context.Barrier(PROCESSES)
+    results = _run(context, [(_contend, (index, barrier)) for index in range(PROCESSES)])
+
+    assert sum(result["allowed"] for result in results) == RATE_LIMIT
+    intervals = sorted(interval for result in results for interval in result["held"])
+    assert intervals, "no process ever acquired the lease"
+    for previous, current in zip(intervals, intervals[1:]):
+        assert current[0] >= previous[1], f"lease held concurrently: {previous} and {current}"
+    for result in results:
+        assert result["missing_changes"] == []
+        assert result["own_echoed"] == []
+
+
+def test_related_index_sees_articles_finished_by_a_worker(context):
+    existing = _run(
+        context,
+        [(_insert_completed, ("solar-grid", "Solar power needs battery storage to keep the grid stable."))],
+    )[0]
+    ready = context.Event()
+    (before, after), added = _run(
+        context, [(_web_side, (existing, ready)), (_worker_side, (ready,))]
+    )
+
+    assert before == []
+    assert added in after
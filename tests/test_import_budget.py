@@ -0,0 +1,16 @@
+"""Import-time budget for the modules the web process loads on startup.
+
+``measure`` imports each module in a fresh interpreter, so nothing imported by
+pytest or other tests leaks into the result.
+"""
+
+import pytest
+from app.utils import import_budget
+
+
+@pytest.mark.parametrize("module", import_budget.DEFAULT_MODULES)
+def test_web_modules_import_under_budget_without_heavy_dependencies(module):
+    elapsed_ms, imported = import_budget.measure(module)
+
+    assert elapsed_ms <= import_budget.DEFAULT_BUDGET_MS
+    assert sorted(imported & set(import_budget.HEAVY_MODULES)) == []